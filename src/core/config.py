@@ -183,5 +183,6 @@ class Config:
             "language": "zh_CN",
             "default_analysis_type": "Full Analysis",
             "auto_save": False,
-            "export_format": "JSON"
+            "export_format": "JSON",
+            "llm_disk_cache": False
         }
\ No newline at end of file
@@ -2,12 +2,25 @@
 Requirements Analyzer - Main analysis engine for extracting and structuring requirements
 """
 
+import hashlib
 import json
 import re
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Deque, List, Optional, Tuple
 from datetime import datetime
+from itertools import repeat
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库json
+    orjson = None
 
 from core.base_module import BaseModule
+from models import response_cache
 from models.model_factory import ModelFactory
 from ui.localization import tr
 from .models import (
@@ -15,178 +28,402 @@ from .models import (
     ComponentSpec, LayoutSpec, StyleSpec, InteractionSpec, AnalysisResult
 )
 
-class RequirementAnalyzer(BaseModule):
+# 提示模板名称
+_P_INITIAL = "initial_analysis"
+_P_COMPONENT = "component_extraction"
+_P_LAYOUT = "layout_analysis"
+_P_STYLING = "styling_analysis"
+_P_INTERACTION = "interaction_analysis"
+_P_VALIDATION = "validation"
+_P_REQUIREMENT_LIST = "requirement_list"
+_P_OVERVIEW = "project_overview"
+_P_COMPONENT_BATCH = "component_batch"
+_P_LAYOUT_BATCH = "layout_batch"
+_P_INTERACTION_BATCH = "interaction_batch"
+
+# 详细分析阶段：需求类型 -> (批量模板名称, 提示文本键中的类型名)
+_DETAIL_KINDS = {
+    RequirementType.UI_COMPONENT: (_P_COMPONENT_BATCH, "component"),
+    RequirementType.LAYOUT: (_P_LAYOUT_BATCH, "layout"),
+    RequirementType.INTERACTION: (_P_INTERACTION_BATCH, "interaction"),
+}
+
+# 完整分析流程中，需求提取仍在流式输出时即预先发起单条分析请求的类型及其模板
+_SPECULATIVE_TEMPLATES = {
+    RequirementType.UI_COMPONENT: _P_COMPONENT,
+    RequirementType.LAYOUT: _P_LAYOUT,
+    RequirementType.INTERACTION: _P_INTERACTION,
+}
+
+# 详细分析时同类需求每批合并的最大条数
+_DETAIL_BATCH_SIZE = 8
+
+# 详细分析时同时进行的模型请求数
+_DETAIL_CONCURRENCY = 4
+
+# 需求提取过程中预先发起、尚未完成的单条分析请求的上限；
+# 已开始的请求无法取消，最终未用到时仍会产生完整的模型调用，限制数量以控制浪费
+_SPECULATIVE_LIMIT = _DETAIL_CONCURRENCY
+
+# 各界面语言对应的回答语言指令，未知语言使用英文
+_LANG_INSTRUCTIONS = {
+    "zh_CN": "请用中文回答。",
+    "en_US": "Please respond in English.",
+}
+
+# 需求歧义检测：模糊措辞（按报告优先级排列）与相互矛盾的描述词
+_VAGUE_WORDS_EN = ('somehow', 'maybe', 'probably', 'might', 'could', 'should probably')
+_VAGUE_WORDS_ZH = ('可能', '也许', '大概', '或许', '应该可能', '某种程度上')
+_VAGUE_EN_RE = re.compile('|'.join(map(re.escape, _VAGUE_WORDS_EN)), re.IGNORECASE)
+_VAGUE_ZH_RE = re.compile('|'.join(map(re.escape, _VAGUE_WORDS_ZH)))
+_VAGUE_CHECKS = ((_VAGUE_EN_RE, _VAGUE_WORDS_EN), (_VAGUE_ZH_RE, _VAGUE_WORDS_ZH))
+_CONTRADICTORY_PAIRS = (frozenset(('simple', 'complex')), frozenset(('简单', '复杂')))
+_CONTRADICTION_RE = re.compile('|'.join(term for pair in _CONTRADICTORY_PAIRS for term in sorted(pair)),
+                               re.IGNORECASE)
+
+# 枚举值到成员的映射，避免逐条调用Enum构造
+_TYPE_BY_VALUE = {member.value: member for member in RequirementType}
+_PRIORITY_BY_VALUE = {member.value: member for member in RequirementPriority}
+
+# 可行性评分：按需求类型的基础分与按优先级的调整系数（critical需求可能更复杂），
+# 模块加载时算出每种（类型, 优先级）组合的分值
+_FEASIBILITY_TYPE_SCORES = {
+    RequirementType.FUNCTIONAL: 0.9,
+    RequirementType.UI_COMPONENT: 0.95,
+    RequirementType.PERFORMANCE: 0.7,
+    RequirementType.ACCESSIBILITY: 0.8,
+}
+_FEASIBILITY_PRIORITY_FACTORS = {
+    RequirementPriority.CRITICAL: 0.9,
+    RequirementPriority.LOW: 1.1,
+}
+_FEASIBILITY_SCORES = {
+    (req_type, priority): _FEASIBILITY_TYPE_SCORES.get(req_type, 1.0)
+                          * _FEASIBILITY_PRIORITY_FACTORS.get(priority, 1.0)
+    for req_type in RequirementType
+    for priority in RequirementPriority
+}
+
+# 工作量估算：按需求类型的基础点数与按优先级的放大系数，同样预先算出每种组合的点数
+_EFFORT_TYPE_POINTS = {
+    RequirementType.UI_COMPONENT: 2,
+    RequirementType.LAYOUT: 3,
+    RequirementType.INTERACTION: 2,
+    RequirementType.PERFORMANCE: 4,
+}
+_EFFORT_PRIORITY_FACTORS = {
+    RequirementPriority.CRITICAL: 1.5,
+    RequirementPriority.HIGH: 1.2,
+}
+_EFFORT_POINTS = {
+    (req_type, priority): _EFFORT_TYPE_POINTS.get(req_type, 1)
+                          * _EFFORT_PRIORITY_FACTORS.get(priority, 1)
+    for req_type in RequirementType
+    for priority in RequirementPriority
+}
+
+# 需求字典缺失字段的默认值；列表字段用不可变元组，构造时再复制
+_REQ_DEFAULTS = {
+    'title': '',
+    'description': '',
+    'type': None,
+    'priority': None,
+    'rationale': '',
+    'acceptance_criteria': (),
+    'estimated_effort': None,
+    'tags': (),
+}
+
+def _own_list(value):
+    """Copy list-like values so each requirement owns its list; pass anything else through"""
+    return list(value) if type(value) is list or type(value) is tuple else value
+
+# 流式输出合并阈值：累计到一定字符数或超过时间间隔才向界面发送一次
+# （按字符数而非块数计，不同服务商每块的长度差别很大）
+_STREAM_FLUSH_CHARS = 64
+_STREAM_FLUSH_INTERVAL = 0.05  # seconds
+
+# 后台解析时最多允许积压的响应数，超出后先应用最早的结果
+_PARSE_AHEAD = 2
+
+# 匹配响应首尾的markdown代码块标记（```json / ```）
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?\n?|\n?```\s*\Z")
+
+def _loads(data):
+    """Parse JSON text, using orjson when available
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to handle the standard exception.
     """
-    Analyzes user input to extract and structure UI/UX requirements
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _loads_plain(response: str):
+    """Parse a response that is already plain JSON, or return None if it needs cleaning"""
+    text = _FENCE_RE.sub("", response).strip()
+    if text.startswith(('{', '[')):
+        try:
+            return _loads(text)
+        except ValueError:
+            pass
+    return None
+
+# 详细分析文本回退解析的段落标题：按判断优先级排列，每个段落一组先行断言，
+# 从行首匹配时按顺序尝试各组，lastgroup 即为命中的段落名
+_SECTION_KEYWORDS = (
+    ("description", ("详细描述", "描述")),
+    ("user_stories", ("用户故事", "用户需求")),
+    ("acceptance_criteria", ("验收标准", "验收条件")),
+    ("business_value", ("业务价值",)),
+    ("functional_requirements", ("功能需求",)),
+    ("constraints", ("约束",)),
+    ("dependencies", ("依赖",)),
+    ("risks", ("风险",)),
+)
+_SECTION_RE = re.compile('|'.join(
+    f"(?=.*(?:{'|'.join(keywords)}))(?P<{section}>)" for section, keywords in _SECTION_KEYWORDS
+))
+_LIST_SECTIONS = frozenset(("user_stories", "acceptance_criteria", "functional_requirements",
+                            "constraints", "dependencies", "risks"))
+_BULLET_RE = re.compile(r'- |• |[123]\. ')
+
+class _TextAnalysis(dict):
+    """Detail analysis recovered from a non-JSON response; never cached for reuse"""
+
+# 文本回退解析：编号或项目符号开头的行，分组为去掉标记后的标题
+_LIST_ITEM_RE = re.compile(r'(?:\d+\.|[-*] )\s*(.*)')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially different texts compare equal"""
+    return _WHITESPACE_RE.sub(' ', text).strip().casefold()
+
+# 逐条需求提示中原始需求文档的长度上限（字符）；超出时只保留与需求相关的句子
+_DETAIL_CONTEXT_CHARS = 6000
+# 文档按句切分（保留句末标点与换行）
+_CONTEXT_SENTENCE_RE = re.compile(r'[^。！？；!?;\n]*(?:[。！？；!?;]+|\n+|$)')
+# 相关度检索词：英文单词，或中文连续字符（再拆为二元组）
+_CONTEXT_TERM_RE = re.compile(r'[a-z0-9_]{2,}|[\u4e00-\u9fff]+')
+
+def _context_terms(text: str) -> frozenset:
+    """Lowercased words plus CJK character bigrams used to rank document sentences"""
+    terms = set()
+    for token in _CONTEXT_TERM_RE.findall(text.lower()):
+        if token[0] >= '\u4e00':
+            terms.update(token[i:i + 2] for i in range(max(len(token) - 1, 1)))
+        else:
+            terms.add(token)
+    return frozenset(terms)
+
+# 流式JSON数组扫描：字符串外的结构字符、字符串内的引号/转义、数组元素之间的分隔符
+_JSON_STRUCT_RE = re.compile(r'["{}\[\]]')
+_JSON_STRING_RE = re.compile(r'["\\]')
+_JSON_SEPARATOR_RE = re.compile(r'[\s,]*')
+_JSON_OPENERS = {'}': '{', ']': '['}
+
+def _find_json_span(text: str, open_ch: str, close_ch: str) -> Optional[str]:
+    """Return the first balanced open_ch ... close_ch block of text, ignoring string contents
+    
+    If the block is never closed, falls back to the span ending at the last
+    close_ch, which is what a greedy regex search would have returned.
     """
+    start = text.find(open_ch)
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    pos = start
+    while True:
+        m = (_JSON_STRING_RE if in_string else _JSON_STRUCT_RE).search(text, pos)
+        if m is None:
+            break
+        c = m.group()
+        pos = m.end()
+        if in_string:
+            if c == '"':
+                in_string = False
+            else:
+                pos += 1  # 跳过被转义的字符
+        elif c == '"':
+            in_string = True
+        elif c == open_ch:
+            depth += 1
+        elif c == close_ch:
+            depth -= 1
+            if depth == 0:
+                return text[start:pos]
+    end = text.rfind(close_ch)
+    return text[start:end + 1] if end > start else None
+
+class _JsonArrayStream:
+    """Incrementally decode the objects of a streamed top-level JSON array
     
-    def __init__(self, config):
-        super().__init__("RequirementAnalyzer", config)
-        self.model_factory = ModelFactory(config)
-        self.config = config
-        
-        # Analysis prompts for different aspects
-        self.prompts = {
-            'initial_analysis': self._get_initial_analysis_prompt(),
-            'component_extraction': self._get_component_extraction_prompt(),
-            'layout_analysis': self._get_layout_analysis_prompt(),
-            'styling_analysis': self._get_styling_analysis_prompt(),
-            'interaction_analysis': self._get_interaction_analysis_prompt(),
-            'validation': self._get_validation_prompt()
-        }
+    Each object is parsed as soon as its closing brace arrives, so decoding
+    overlaps with the rest of the stream; ``on_item`` is called with each
+    decoded object. ``complete`` reports whether the text seen was a
+    well-formed array of objects; otherwise callers should parse the full
+    response instead.
+    """
     
-    def process(self, input_data: Dict[str, Any]) -> AnalysisResult:
-        """
-        Process user requirements and return structured analysis
-        
-        Args:
-            input_data: {
-                'text': str,  # User requirements text
-                'context': str,  # Additional context (optional)
-                'platform': str,  # Target platform (web, mobile, desktop)
-                'existing_analysis': AnalysisResult  # Previous analysis to refine (optional)
-                'phase': str,  # 'list' for requirement list extraction, 'detail' for detailed analysis
-                'requirement_list': List[Dict]  # For detailed analysis phase
-            }
-        
-        Returns:
-            AnalysisResult: Structured requirements analysis
-        """
-        requirements_text = input_data.get('text', '')
-        context = input_data.get('context', '')
-        platform = input_data.get('platform', 'web')
-        existing_analysis = input_data.get('existing_analysis')
-        phase = input_data.get('phase', 'complete')  # 'list', 'detail', or 'complete'
-        requirement_list = input_data.get('requirement_list', [])
-        
-        if not requirements_text.strip() and phase != 'detail':
-            raise ValueError("Requirements text cannot be empty")
-        
-        # Phase 1: Extract requirement list only
-        if phase == 'list':
-            return self._extract_requirement_list_only(requirements_text, context, platform)
-        
-        # Phase 2: Detailed analysis of specific requirements
-        elif phase == 'detail':
-            return self._analyze_requirements_in_detail(requirement_list, requirements_text, context, platform)
-        
-        # Complete analysis (original behavior)
-        else:
-            return self._complete_analysis(requirements_text, context, platform, existing_analysis)
-        
-    def _extract_requirement_list_only(self, requirements_text: str, context: str, platform: str) -> AnalysisResult:
-        """Phase 1: Extract only the requirement list to ensure completeness"""
-        self.update_progress(10, tr("starting_requirements_list_extraction"))
-        
-        # Step 1: Project overview
-        self.update_progress(30, tr("analyzing_requirements_overview"))
-        project_overview, target_audience = self._analyze_project_overview(requirements_text, context)
-        
-        # Step 2: Extract requirement list with minimal details
-        self.update_progress(70, tr("extracting_requirements_list"))
-        requirements = self._extract_requirements_list(requirements_text, context, platform)
-        
-        self.update_progress(100, tr("requirements_list_extraction_completed"))
-        
-        # Return minimal result with just the list
-        return AnalysisResult(
-            requirements=requirements,
-            project_overview=project_overview,
-            target_audience=target_audience,
-            platform=platform,
-            framework_recommendations=[],
-            completeness_score=0.3,  # Partial completion
-            clarity_score=0.5,
-            feasibility_score=0.8,
-            gaps=[],
-            ambiguities=[],
-            recommendations=[tr("recommendation_proceed_detailed_analysis")],
-            total_estimated_effort="TBD",
-            development_phases=[]
-        )
+    def __init__(self, on_item: Optional[Callable[[Any], None]] = None):
+        self._on_item = on_item
+        self.reset()
     
-    def _analyze_requirements_in_detail(self, requirement_list: List[Dict], original_text: str, 
-                                       context: str, platform: str) -> AnalysisResult:
-        """Phase 2: Detailed analysis of each requirement"""
-        self.update_progress(10, tr("starting_detailed_analysis"))
-        
-        # Convert requirement list to Requirement objects
-        requirements = []
-        for req_data in requirement_list:
-            req = self._create_requirement_from_dict(req_data, original_text)
-            if req:
-                requirements.append(req)
-        
-        # Analyze each requirement in detail
-        total_reqs = len(requirements)
-        
-        for i, requirement in enumerate(requirements):
-            progress = 20 + (60 * (i + 1) // total_reqs)
-            self.update_progress(progress, tr("analyzing_requirement_detail").format(
-                current=i+1, total=total_reqs, title=requirement.title[:30]
-            ))
-            
-            # Detailed component analysis for UI components
-            if requirement.type == RequirementType.UI_COMPONENT:
-                self._analyze_single_component(requirement, original_text)
-            
-            # Layout analysis for layout requirements
-            elif requirement.type == RequirementType.LAYOUT:
-                self._analyze_single_layout(requirement, original_text)
-            
-            # Interaction analysis
-            elif requirement.type == RequirementType.INTERACTION:
-                self._analyze_single_interaction(requirement, original_text)
-        
-        # Final validation and scoring
-        self.update_progress(90, tr("validating_requirements"))
-        analysis_result = self._validate_and_score(
-            requirements, "", "", platform, original_text
-        )
-        
-        self.update_progress(100, tr("detailed_analysis_completed"))
-        return analysis_result
+    def reset(self):
+        """Discard everything seen so far"""
+        self.items: List[Any] = []
+        self._stack: List[str] = []
+        self._item_parts: Optional[List[str]] = None
+        self._in_string = False
+        self._escaped = False
+        self._commas = 0  # 当前元素间隙中已出现的逗号数
+        self._state = 0  # 0: 数组开始前, 1: 数组内, 2: 数组已结束
+        self._invalid = False
     
-    def _complete_analysis(self, requirements_text: str, context: str, platform: str, 
-                          existing_analysis: Optional[AnalysisResult]) -> AnalysisResult:
-        """Original complete analysis flow"""
-        self.update_progress(10, tr("starting_requirements_analysis"))
-        
-        # Step 1: Initial analysis and project overview
-        self.update_progress(20, tr("analyzing_requirements_overview"))
-        project_overview, target_audience = self._analyze_project_overview(requirements_text, context)
-        
-        # Step 2: Extract and categorize requirements
-        self.update_progress(40, tr("extracting_categorizing_requirements"))
-        requirements = self._extract_requirements(requirements_text, context, platform)
-        
-        # Step 3: Analyze components
-        self.update_progress(60, tr("analyzing_ui_components_phase"))
-        self._analyze_components(requirements, requirements_text)
-        
-        # Step 4: Analyze layout and interactions
-        self.update_progress(80, tr("analyzing_layout_interactions"))
-        self._analyze_layout_and_interactions(requirements, requirements_text)
-        
-        # Step 5: Validate and score
-        self.update_progress(90, tr("validating_requirements"))
-        analysis_result = self._validate_and_score(
-            requirements, project_overview, target_audience, platform, requirements_text
-        )
-        
-        self.update_progress(100, tr("requirements_analysis_completed"))
-        return analysis_result
+    @property
+    def complete(self) -> bool:
+        return self._state == 2 and not self._invalid
     
-    def _analyze_project_overview(self, requirements_text: str, context: str) -> Tuple[str, str]:
-        """Extract project overview and target audience"""
-        try:
-            # 使用模块配置指定的模型
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
+    def feed(self, chunk: str):
+        """Consume the next piece of streamed text"""
+        if self._invalid or not chunk:
+            return
+        stack = self._stack
+        n = len(chunk)
+        i = 0
+        if self._escaped:
+            self._escaped = False
+            i = 1
+        item_from = 0 if self._item_parts is not None else -1
+        gap_from = 0
+        
+        while i < n:
+            if self._in_string:
+                m = _JSON_STRING_RE.search(chunk, i)
+                if m is None:
+                    break
+                pos = m.start()
+                if chunk[pos] == '"':
+                    self._in_string = False
+                    i = pos + 1
+                else:
+                    # 跳过被转义的字符，它可能落在下一个块中
+                    i = pos + 2
+                    self._escaped = i > n
+                continue
             
-            prompt = f"""
-            {self._get_language_instruction()}
+            m = _JSON_STRUCT_RE.search(chunk, i)
+            if m is None:
+                break
+            pos = m.start()
+            c = chunk[pos]
+            i = pos + 1
+            
+            if stack:
+                # 位于某个数组元素内部
+                if c == '"':
+                    self._in_string = True
+                elif c == '{' or c == '[':
+                    stack.append(c)
+                elif _JSON_OPENERS[c] != stack.pop():
+                    self._invalid = True
+                    return
+                elif not stack:
+                    self._item_parts.append(chunk[item_from:i])
+                    text = "".join(self._item_parts)
+                    self._item_parts = None
+                    try:
+                        item = _loads(text)
+                    except ValueError:
+                        self._invalid = True
+                        return
+                    self.items.append(item)
+                    if self._on_item is not None:
+                        self._on_item(item)
+                    gap_from = i
+            elif self._state == 1:
+                # 数组元素之间只允许出现空白和恰好一个逗号
+                if _JSON_SEPARATOR_RE.fullmatch(chunk, gap_from, pos) is None:
+                    self._invalid = True
+                    return
+                commas = self._commas + chunk.count(',', gap_from, pos)
+                self._commas = 0
+                if c == '{' and commas == (1 if self.items else 0):
+                    stack.append(c)
+                    self._item_parts = []
+                    item_from = pos
+                elif c == ']' and commas == 0:
+                    self._state = 2
+                else:
+                    self._invalid = True
+                    return
+            elif self._state == 0 and c == '[':
+                self._state = 1
+                gap_from = i
+            else:
+                self._invalid = True
+                return
+        
+        if self._item_parts is not None:
+            self._item_parts.append(chunk[item_from:])
+        elif self._state == 1:
+            if _JSON_SEPARATOR_RE.fullmatch(chunk, gap_from) is None:
+                self._invalid = True
+            else:
+                self._commas += chunk.count(',', gap_from)
+
+@dataclass
+class _RequirementProfile:
+    """Aggregates over a requirement list, gathered in one pass for scoring"""
+    total: int
+    analyzed: int
+    by_type: Dict[RequirementType, List[Requirement]]
+    by_priority: Dict[RequirementPriority, List[Requirement]]
+    type_priority_counts: Counter  # (type, priority) -> count
+    incomplete: List[Tuple[str, str]]  # (gap message key, title), in requirement order
+    ambiguous: List[Tuple[str, Requirement, Optional[str]]]  # (ambiguity message key, requirement, vague word)
+    
+    @classmethod
+    def build(cls, requirements: List[Requirement]) -> "_RequirementProfile":
+        analyzed = 0
+        by_type = defaultdict(list)
+        by_priority = defaultdict(list)
+        type_priority_counts = Counter()
+        incomplete = []
+        ambiguous = []
+        for req in requirements:
+            if req.status is RequirementStatus.ANALYZED:
+                analyzed += 1
+            by_type[req.type].append(req)
+            by_priority[req.priority].append(req)
+            type_priority_counts[req.type, req.priority] += 1
+            if not req.description.strip():
+                incomplete.append(("gap_missing_description", req.title))
+            if not req.acceptance_criteria:
+                incomplete.append(("gap_missing_acceptance_criteria", req.title))
+            
+            # 模糊用语：先用忽略大小写的正则判断是否命中，命中时才转小写并按列表顺序确定报告的词
+            text = req.title + ' ' + req.description
+            for vague_re, vague_words in _VAGUE_CHECKS:
+                match = vague_re.search(text)
+                if match:
+                    # 个别字符（如"ſ"）忽略大小写匹配成功但lower()后不含该词，此时报告匹配到的文本
+                    lowered = text.lower()
+                    word = next((word for word in vague_words if word in lowered), match.group().lower())
+                    ambiguous.append(("ambiguity_vague_language", req, word))
+            found_terms = {term.lower() for term in _CONTRADICTION_RE.findall(text)}
+            if any(pair <= found_terms for pair in _CONTRADICTORY_PAIRS):
+                ambiguous.append(("ambiguity_contradictory", req, None))
+        return cls(len(requirements), analyzed, by_type, by_priority, type_priority_counts,
+                   incomplete, ambiguous)
+
+# 提示词模板常量：模块加载时创建一次，各实例与各次调用共享同一字符串
+# 逐条需求分析的模板依次为：语言指令、固定的JSON结构说明、原始需求文档、当前需求。
+# 不变部分在前，使服务端的前缀缓存可跨需求、跨分析复用，原始需求文档在同一次分析内复用
+_PROJECT_OVERVIEW_PROMPT = """
+            {language_instruction}
             
             Analyze the following requirements and provide:
             1. A concise project overview (2-3 sentences)
@@ -204,1422 +441,1635 @@ class RequirementAnalyzer(BaseModule):
                 "target_audience": "Who will use this application"
             }}
             """
-            
-            # 尝试使用流式输出
-            response = ""
-            try:
-                # 发送分析开始的提示
-                self.streaming_text_updated.emit(tr("analyzing_project_overview") + "\n\n")
-                
-                if hasattr(model, 'generate_stream'):
-                    for chunk in model.generate_stream(prompt):
-                        response += chunk
-                        self.streaming_text_updated.emit(chunk)
-                else:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-            except Exception as stream_error:
-                # 流式输出失败，使用普通输出
-                response = model.generate(prompt)
-                self.streaming_text_updated.emit(response)
-            
-            self.streaming_text_updated.emit("\n\n" + "="*50 + "\n\n")
-            
-            try:
-                result = json.loads(response)
-                # 检查result是否为字典
-                if isinstance(result, dict):
-                    return result.get('project_overview', ''), result.get('target_audience', '')
-                elif isinstance(result, list) and len(result) > 0:
-                    # 如果返回的是列表，尝试从第一个元素获取信息
-                    first_item = result[0]
-                    if isinstance(first_item, dict):
-                        return first_item.get('project_overview', ''), first_item.get('target_audience', '')
-                    else:
-                        # 如果列表元素不是字典，使用fallback
-                        return self._extract_overview_fallback(response)
-                else:
-                    # 其他情况使用fallback
-                    return self._extract_overview_fallback(response)
-            except json.JSONDecodeError:
-                # Fallback parsing
-                return self._extract_overview_fallback(response)
-                
-        except Exception as e:
-            self.error_occurred.emit(f"Error analyzing project overview: {str(e)}")
-            return "", ""
-    
-    def _extract_requirements(self, requirements_text: str, context: str, platform: str) -> List[Requirement]:
-        """Extract individual requirements from text"""
-        try:
-            # 使用模块配置指定的模型
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
-            
-            prompt = self.prompts['initial_analysis'].format(
-                language_instruction=self._get_language_instruction(),
-                requirements_text=requirements_text,
-                context=context,
-                platform=platform
-            )
-            
-            # 流式输出需求提取过程
-            response = ""
-            try:
-                self.streaming_text_updated.emit(tr("extracting_requirements") + "\n\n")
-                
-                if hasattr(model, 'generate_stream'):
-                    for chunk in model.generate_stream(prompt):
-                        response += chunk
-                        self.streaming_text_updated.emit(chunk)
-                else:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-            except Exception:
-                response = model.generate(prompt)
-                self.streaming_text_updated.emit(response)
-            
-            self.streaming_text_updated.emit("\n\n" + "="*50 + "\n\n")
-            
-            # Parse the response and create Requirement objects
-            return self._parse_requirements_response(response, requirements_text)
-            
-        except Exception as e:
-            self.error_occurred.emit(f"Error extracting requirements: {str(e)}")
-            return []
-    
-    def _extract_requirements_list(self, requirements_text: str, context: str, platform: str) -> List[Requirement]:
-        """Extract basic requirement list with minimal details for first phase"""
-        try:
-            # 使用模块配置指定的模型
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
-            
-            prompt = self._get_requirement_list_prompt().format(
-                language_instruction=self._get_language_instruction(),
-                requirements_text=requirements_text,
-                context=context,
-                platform=platform
-            )
-            
-            # 流式输出需求列表提取过程
-            response = ""
-            try:
-                self.streaming_text_updated.emit(tr("extracting_requirements_list") + "\n\n")
-                
-                if hasattr(model, 'generate_stream'):
-                    for chunk in model.generate_stream(prompt):
-                        response += chunk
-                        self.streaming_text_updated.emit(chunk)
-                else:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-            except Exception:
-                response = model.generate(prompt)
-                self.streaming_text_updated.emit(response)
-            
-            self.streaming_text_updated.emit("\n\n" + "="*50 + "\n\n")
-            
-            # Parse the response and create basic Requirement objects
-            return self._parse_requirements_response(response, requirements_text)
-            
-        except Exception as e:
-            self.error_occurred.emit(f"Error extracting requirements list: {str(e)}")
-            return []
-    
-    def _analyze_single_component(self, requirement: Requirement, original_text: str):
-        """Analyze a single UI component requirement in detail"""
-        try:
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
-            
-            self.streaming_text_updated.emit(tr("analyzing_component_detail").format(title=requirement.title) + "\n")
-            
-            prompt = self.prompts['component_extraction'].format(
-                language_instruction=self._get_language_instruction(),
-                requirement_title=requirement.title,
-                requirement_description=requirement.description,
-                original_text=original_text
-            )
-            
-            response = ""
+
+_INITIAL_ANALYSIS_PROMPT = """
+        {language_instruction}
+        
+        Analyze the following requirements text and extract individual requirements. 
+        Categorize each requirement by type and priority.
+        
+        Requirements text:
+        {requirements_text}
+        
+        Additional context:
+        {context}
+        
+        Target platform: {platform}
+        
+        Return a JSON array of requirements with this structure:
+        [
+            {{
+                "title": "Brief requirement title",
+                "description": "Detailed description",
+                "type": "functional|ui_component|layout|styling|interaction|data|performance|accessibility|business",
+                "priority": "critical|high|medium|low",
+                "rationale": "Why this requirement exists",
+                "acceptance_criteria": ["criteria 1", "criteria 2"],
+                "estimated_effort": "XS|S|M|L|XL",
+                "tags": ["tag1", "tag2"]
+            }}
+        ]
+        
+        Ensure requirements are:
+        1. Specific and actionable
+        2. Properly categorized
+        3. Realistically prioritized
+        4. Include clear acceptance criteria
+        """
+
+_DETAIL_PROMPT_HEAD = """
+        {language_instruction}
+        """
+
+# 批量详细分析的结尾：同类需求按编号列出，要求返回以编号标识的JSON数组
+_DETAIL_BATCH_TAIL = """
+        以上是单条需求的分析要求。下面按编号列出了多条需求，请逐条分析并返回一个JSON数组，
+        数组中每个元素对应一条需求，采用上述JSON结构，并额外包含 "id" 字段，取值为该需求的编号。
+        
+        基于原始需求文档: {original_text}
+        
+        需分析的需求：
+        {requirement_items}
+        """
+
+_COMPONENT_DETAIL_SPEC = """
+        请从需求分析的角度深入分析文末给出的UI组件需求，输出详细的需求规格说明。请返回JSON格式：
+        
+        {{
+            "requirement_details": {{
+                "detailed_description": "对该组件需求的详细描述，包括功能目的、使用场景、预期效果",
+                "user_stories": [
+                    "作为用户，我希望能够...",
+                    "当我使用这个组件时，我期望..."
+                ],
+                "business_value": "这个组件为业务带来的价值和意义",
+                "functional_requirements": [
+                    "必须支持的具体功能点1",
+                    "必须支持的具体功能点2"
+                ],
+                "non_functional_requirements": [
+                    "性能要求：响应时间<300ms",
+                    "可用性要求：支持键盘导航",
+                    "兼容性要求：支持IE11+"
+                ],
+                "acceptance_criteria": [
+                    "验收标准1：当用户点击按钮时，应该...",
+                    "验收标准2：当输入无效数据时，应该显示...",
+                    "验收标准3：在移动端访问时，组件应该..."
+                ],
+                "constraints": [
+                    "设计约束：必须符合现有设计规范",
+                    "技术约束：需要兼容现有框架",
+                    "业务约束：不能超过预算限制"
+                ],
+                "assumptions": [
+                    "假设用户已经登录系统",
+                    "假设网络连接稳定"
+                ],
+                "dependencies": [
+                    "依赖于用户认证模块",
+                    "依赖于数据API接口"
+                ],
+                "risks": [
+                    "风险1：复杂交互可能影响性能",
+                    "风险2：浏览器兼容性问题"
+                ]
+            }},
+            "layout_considerations": {{
+                "description": "该组件在页面布局中的考虑因素",
+                "placement": "组件在页面中的位置和作用",
+                "responsive_needs": "响应式设计需求说明",
+                "spacing_requirements": "与其他元素的间距要求"
+            }},
+            "ux_considerations": {{
+                "usability": "易用性要求和考虑",
+                "accessibility": "无障碍访问要求",
+                "user_feedback": "用户反馈和状态提示需求",
+                "error_handling": "错误处理和用户引导"
+            }}
+        }}
+        
+        注意：
+        1. 专注于需求分析，不要涉及具体的技术实现细节
+        2. 验收标准要具体、可测试、可衡量
+        3. 考虑用户体验和业务价值
+        4. 识别潜在的风险和依赖关系
+        """
+
+_COMPONENT_EXTRACTION_PROMPT = _DETAIL_PROMPT_HEAD + _COMPONENT_DETAIL_SPEC + """
+        基于原始需求文档: {original_text}
+        
+        对UI组件需求进行详细的需求分析: "{requirement_title}"
+        需求描述: {requirement_description}
+        """
+_COMPONENT_BATCH_PROMPT = _DETAIL_PROMPT_HEAD + _COMPONENT_DETAIL_SPEC + _DETAIL_BATCH_TAIL
+
+_LAYOUT_DETAIL_SPEC = """
+        请从需求分析的角度深入分析文末给出的布局需求，输出详细的需求规格说明。请返回JSON格式：
+        
+        {{
+            "requirement_details": {{
+                "detailed_description": "对该布局需求的详细描述，包括布局目的、信息架构、用户流程",
+                "user_stories": [
+                    "作为用户，我希望页面布局能够...",
+                    "当我浏览页面时，我期望信息组织..."
+                ],
+                "business_value": "这个布局设计为业务带来的价值",
+                "functional_requirements": [
+                    "必须清晰展示主要功能区域",
+                    "必须支持快速导航和信息查找",
+                    "必须适配不同设备屏幕"
+                ],
+                "acceptance_criteria": [
+                    "验收标准1：在桌面端，主要内容区域应占据...",
+                    "验收标准2：在移动端，导航菜单应该...",
+                    "验收标准3：页面加载后，用户应该能够在3秒内找到..."
+                ],
+                "constraints": [
+                    "设计约束：必须遵循既定的设计规范",
+                    "内容约束：需要容纳特定数量的信息模块",
+                    "技术约束：需要支持多种浏览器"
+                ]
+            }},
+            "information_architecture": {{
+                "content_hierarchy": "内容层级和重要性划分",
+                "navigation_flow": "用户导航流程和路径",
+                "content_grouping": "内容分组和关联关系"
+            }},
+            "responsive_requirements": {{
+                "breakpoint_behavior": "不同断点下的布局行为需求",
+                "content_priority": "内容在不同屏幕尺寸下的优先级",
+                "interaction_adaptation": "交互方式在不同设备上的适配需求"
+            }},
+            "ux_requirements": {{
+                "visual_hierarchy": "视觉层次和引导需求",
+                "scan_patterns": "用户浏览模式和视觉流",
+                "accessibility": "无障碍访问的布局要求"
+            }}
+        }}
+        
+        注意：
+        1. 专注于布局的功能性和用户体验需求
+        2. 不要涉及具体的CSS实现细节
+        3. 考虑信息架构和用户认知
+        4. 验收标准要基于用户行为和业务目标
+        """
+
+_LAYOUT_ANALYSIS_PROMPT = _DETAIL_PROMPT_HEAD + _LAYOUT_DETAIL_SPEC + """
+        基于原始需求文档: {original_text}
+        
+        对布局需求进行详细的需求分析: {requirement_description}
+        """
+_LAYOUT_BATCH_PROMPT = _DETAIL_PROMPT_HEAD + _LAYOUT_DETAIL_SPEC + _DETAIL_BATCH_TAIL
+
+_STYLING_ANALYSIS_PROMPT = """
+        {language_instruction}
+        
+        Analyze styling requirements and provide specification as JSON:
+        {{
+            "theme": "light|dark|auto",
+            "colors": {{
+                "primary": "#007bff",
+                "secondary": "#6c757d",
+                "background": "#ffffff",
+                "text": "#333333"
+            }},
+            "typography": {{
+                "font_family": "Arial, sans-serif",
+                "font_sizes": {{
+                    "small": "12px",
+                    "medium": "16px",
+                    "large": "24px"
+                }},
+                "line_height": "1.5"
+            }},
+            "spacing": {{
+                "xs": "4px",
+                "sm": "8px",
+                "md": "16px",
+                "lg": "24px",
+                "xl": "32px"
+            }},
+            "borders": {{
+                "radius": "4px",
+                "width": "1px",
+                "style": "solid"
+            }},
+            "shadows": {{
+                "small": "0 1px 3px rgba(0,0,0,0.1)",
+                "medium": "0 4px 6px rgba(0,0,0,0.1)"
+            }},
+            "animations": [
+                {{
+                    "name": "fadeIn",
+                    "duration": "0.3s",
+                    "easing": "ease-in-out"
+                }}
+            ]
+        }}
+        """
+
+_INTERACTION_DETAIL_SPEC = """
+        请从需求分析的角度深入分析文末给出的交互需求，输出详细的需求规格说明。请返回JSON格式：
+        
+        {{
+            "requirement_details": {{
+                "detailed_description": "对该交互需求的详细描述，包括交互目的、使用场景、预期效果",
+                "user_stories": [
+                    "作为用户，当我执行某个操作时，我希望...",
+                    "在特定情况下，系统应该提供..."
+                ],
+                "business_value": "这个交互设计为业务和用户带来的价值",
+                "functional_requirements": [
+                    "必须支持的交互功能点1",
+                    "必须提供的用户反馈2"
+                ],
+                "acceptance_criteria": [
+                    "验收标准1：当用户点击时，在200ms内应该显示...",
+                    "验收标准2：当操作失败时，应该明确提示...",
+                    "验收标准3：支持键盘操作，Tab键顺序应该..."
+                ],
+                "error_scenarios": [
+                    "错误场景1：网络中断时的处理",
+                    "错误场景2：无效输入的反馈"
+                ]
+            }},
+            "interaction_flows": {{
+                "primary_flow": "主要交互流程的详细步骤",
+                "alternative_flows": "备选交互路径和分支",
+                "edge_cases": "边界情况和异常处理"
+            }},
+            "feedback_requirements": {{
+                "visual_feedback": "视觉反馈的需求说明",
+                "audio_feedback": "音频反馈需求（如适用）",
+                "haptic_feedback": "触觉反馈需求（如适用）",
+                "timing_requirements": "反馈时机和持续时间要求"
+            }},
+            "accessibility_requirements": {{
+                "keyboard_navigation": "键盘导航支持需求",
+                "screen_reader": "屏幕阅读器支持需求",
+                "motor_accessibility": "运动障碍用户的交互需求"
+            }}
+        }}
+        
+        注意：
+        1. 专注于交互的功能需求和用户体验
+        2. 不要涉及具体的JavaScript实现
+        3. 考虑所有可能的用户操作路径
+        4. 包含完整的错误处理需求
+        """
+
+_INTERACTION_ANALYSIS_PROMPT = _DETAIL_PROMPT_HEAD + _INTERACTION_DETAIL_SPEC + """
+        基于原始需求文档: {original_text}
+        
+        对交互需求进行详细的需求分析: {requirement_description}
+        """
+_INTERACTION_BATCH_PROMPT = _DETAIL_PROMPT_HEAD + _INTERACTION_DETAIL_SPEC + _DETAIL_BATCH_TAIL
+
+_VALIDATION_PROMPT = """
+        {language_instruction}
+        
+        Review the following requirements for completeness and clarity:
+        {requirements}
+        
+        Identify:
+        1. Missing information
+        2. Ambiguous requirements
+        3. Conflicting requirements
+        4. Implementation feasibility issues
+        
+        Return as JSON:
+        {{
+            "gaps": ["missing item 1", "missing item 2"],
+            "ambiguities": ["unclear requirement 1"],
+            "conflicts": ["requirement A conflicts with B"],
+            "feasibility_issues": ["complex requirement may need breakdown"]
+        }}
+        """
+
+_REQUIREMENT_LIST_PROMPT = """
+        {language_instruction}
+        
+        分析以下需求文本，提取出完整的需求列表。这是第一阶段分析，专注于识别和分类所有需求项目，确保完整性。
+        
+        需求文本:
+        {requirements_text}
+        
+        附加上下文:
+        {context}
+        
+        目标平台: {platform}
+        
+        请返回一个JSON数组，包含所有识别出的需求项目。每个需求项目应该包含基本信息：
+        [
+            {{
+                "id": "REQ-001",
+                "title": "简明的需求标题",
+                "description": "需求的详细描述",
+                "type": "functional|ui_component|layout|styling|interaction|data|performance|accessibility|business",
+                "priority": "critical|high|medium|low",
+                "category": "核心功能|界面设计|数据处理|性能优化|其他",
+                "brief_rationale": "为什么需要这个需求的简要说明"
+            }}
+        ]
+        
+        请确保：
+        1. 提取出所有明确或隐含的需求
+        2. 正确分类每个需求的类型
+        3. 合理设置优先级
+        4. 用简洁明确的语言描述每个需求
+        5. 不要遗漏任何重要的功能或特性需求
+        
+        重点关注：
+        - 功能需求（用户可以做什么）
+        - UI组件需求（需要什么界面元素）
+        - 布局需求（界面如何组织）
+        - 交互需求（用户如何操作）
+        - 数据需求（需要处理什么数据）
+        - 性能需求（速度、响应时间等）
+        - 业务需求（业务逻辑和规则）
+        """
+
+# 各分析环节的提示模板，所有实例共享
+_PROMPTS = {
+    _P_INITIAL: _INITIAL_ANALYSIS_PROMPT,
+    _P_COMPONENT: _COMPONENT_EXTRACTION_PROMPT,
+    _P_LAYOUT: _LAYOUT_ANALYSIS_PROMPT,
+    _P_STYLING: _STYLING_ANALYSIS_PROMPT,
+    _P_INTERACTION: _INTERACTION_ANALYSIS_PROMPT,
+    _P_VALIDATION: _VALIDATION_PROMPT,
+    _P_REQUIREMENT_LIST: _REQUIREMENT_LIST_PROMPT,
+    _P_COMPONENT_BATCH: _COMPONENT_BATCH_PROMPT,
+    _P_LAYOUT_BATCH: _LAYOUT_BATCH_PROMPT,
+    _P_INTERACTION_BATCH: _INTERACTION_BATCH_PROMPT,
+    _P_OVERVIEW: _PROJECT_OVERVIEW_PROMPT
+}
+
+class RequirementAnalyzer(BaseModule):
+    """
+    Analyzes user input to extract and structure UI/UX requirements
+    """
+    
+    def __init__(self, config):
+        super().__init__("RequirementAnalyzer", config)
+        self.model_factory = ModelFactory(config)
+        self.config = config
+        
+        # Analysis prompts for different aspects (shared, read-only)
+        self.prompts = _PROMPTS
+        
+        # 已填入语言指令的模板，按语言指令缓存；每次process()时按当前语言选取
+        self._bound_prompt_cache: Dict[str, Dict[str, str]] = {}
+        self._language_instruction = self._get_language_instruction()
+        self._bound_prompts = self._bind_prompts(self._language_instruction)
+        self._prompt_cache_key: Optional[str] = None
+        # 当前分析使用的模型，首次使用时解析
+        self._model = None
+        # 需求提取过程中预先发起的单条分析请求（按提示的sha1），见 _speculate_detail
+        self._speculative_requests: Dict[bytes, Future] = {}
+        # 长文档的切句结果：(文档, 句子列表, 各句检索词)，见 _relevant_context
+        self._context_index: Optional[Tuple[str, List[str], List[frozenset]]] = None
+        
+        # 需求类型 -> 单条详细分析方法，构造时绑定一次
+        self._single_analyzers = {
+            RequirementType.UI_COMPONENT: self._analyze_single_component,
+            RequirementType.LAYOUT: self._analyze_single_layout,
+            RequirementType.INTERACTION: self._analyze_single_interaction,
+        }
+        
+        # 响应解析线程池，与下一个模型请求并行执行
+        self._parse_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="requirement-parse")
+        # 模型请求线程池，详细分析的多个批次并发请求（共享 models.http_pool 中的连接池）
+        self._request_pool = ThreadPoolExecutor(max_workers=_DETAIL_CONCURRENCY,
+                                                thread_name_prefix="requirement-request")
+        
+        # 详细分析结果缓存：键为(原始文档, 语言指令, 需求类型, 归一化的需求内容)；
+        # 只在一次分析内复用，每次process()时清空，使模型与配置的修改在下次分析生效
+        self._detail_cache: Dict[Tuple, Dict[str, Any]] = {}
+        # 本次详细分析中待分析需求的缓存键，结果应用时写入缓存
+        self._detail_cache_keys: Dict[str, Tuple] = {}
+        
+        # temperature为0的请求结果可复用，按配置同时持久化到磁盘
+        if config.get_app_setting("llm_disk_cache", False):
+            response_cache.enable_disk_cache()
+        
+        # Buffered streaming output (see _emit_chunk)
+        self._emit_buffer: List[str] = []
+        self._emit_size = 0
+        self._emit_last = time.monotonic()
+        self._emit_lock = threading.Lock()
+    
+    def shutdown(self):
+        """Stop the request and parse thread pools; call once the analyzer is no longer used"""
+        # 尚未开始的预先请求直接取消，正在进行的请求不等待其完成
+        for request in self._speculative_requests.values():
+            request.cancel()
+        self._speculative_requests.clear()
+        self._request_pool.shutdown(wait=False)
+        self._parse_pool.shutdown(wait=False)
+    
+    def process(self, input_data: Dict[str, Any]) -> AnalysisResult:
+        """
+        Process user requirements and return structured analysis
+        
+        Args:
+            input_data: {
+                'text': str,  # User requirements text
+                'context': str,  # Additional context (optional)
+                'platform': str,  # Target platform (web, mobile, desktop)
+                'existing_analysis': AnalysisResult  # Previous analysis to refine (optional)
+                'phase': str,  # 'list' for requirement list extraction, 'detail' for detailed analysis
+                'requirement_list': List[Dict]  # For detailed analysis phase
+            }
+        
+        Returns:
+            AnalysisResult: Structured requirements analysis
+        """
+        requirements_text = input_data.get('text', '')
+        context = input_data.get('context', '')
+        platform = input_data.get('platform', 'web')
+        existing_analysis = input_data.get('existing_analysis')
+        phase = input_data.get('phase', 'complete')  # 'list', 'detail', or 'complete'
+        requirement_list = input_data.get('requirement_list', [])
+        
+        # 语言设置可能在运行时变化，每次分析开始时读取一次并据此选取模板
+        self._language_instruction = self._get_language_instruction()
+        self._bound_prompts = self._bind_prompts(self._language_instruction)
+        # 同一文档的逐条需求调用共用一个缓存键，使服务端将其路由到同一前缀缓存
+        self._prompt_cache_key = "req-" + hashlib.sha256(requirements_text.encode("utf-8")).hexdigest()[:16]
+        # 模型配置可能在两次分析之间修改，每次分析重新解析一次
+        self._model = None
+        self._detail_cache.clear()
+        
+        if not requirements_text.strip() and phase != 'detail':
+            raise ValueError("Requirements text cannot be empty")
+        
+        # Phase 1: Extract requirement list only
+        if phase == 'list':
+            return self._extract_requirement_list_only(requirements_text, context, platform)
+        
+        # Phase 2: Detailed analysis of specific requirements
+        elif phase == 'detail':
+            return self._analyze_requirements_in_detail(requirement_list, requirements_text, context, platform)
+        
+        # Complete analysis (original behavior)
+        else:
+            return self._complete_analysis(requirements_text, context, platform, existing_analysis)
+        
+    def _extract_requirement_list_only(self, requirements_text: str, context: str, platform: str) -> AnalysisResult:
+        """Phase 1: Extract only the requirement list to ensure completeness"""
+        self.update_progress(10, tr("starting_requirements_list_extraction"))
+        
+        # 两个请求相互独立：概述在请求线程池中静默运行，需求列表在当前线程流式输出
+        # Step 1: Project overview (background)
+        self.update_progress(30, tr("analyzing_requirements_overview"))
+        overview_future = self._request_pool.submit(self._analyze_project_overview, requirements_text, context, False)
+        
+        # Step 2: Extract requirement list with minimal details
+        self.update_progress(70, tr("extracting_requirements_list"))
+        requirements = self._extract_requirements_list(requirements_text, context, platform)
+        project_overview, target_audience = overview_future.result()
+        
+        self.update_progress(100, tr("requirements_list_extraction_completed"))
+        
+        # Return minimal result with just the list
+        return AnalysisResult(
+            requirements=requirements,
+            project_overview=project_overview,
+            target_audience=target_audience,
+            platform=platform,
+            framework_recommendations=[],
+            completeness_score=0.3,  # Partial completion
+            clarity_score=0.5,
+            feasibility_score=0.8,
+            gaps=[],
+            ambiguities=[],
+            recommendations=[tr("recommendation_proceed_detailed_analysis")],
+            total_estimated_effort="TBD",
+            development_phases=[]
+        )
+    
+    def _analyze_requirements_in_detail(self, requirement_list: List[Dict], original_text: str, 
+                                       context: str, platform: str) -> AnalysisResult:
+        """Phase 2: Detailed analysis of each requirement"""
+        if not requirement_list:
+            return self._empty_result(platform, original_text)
+        
+        self.update_progress(10, tr("starting_detailed_analysis"))
+        
+        # Convert requirement list to Requirement objects
+        requirements = self._requirements_from_dicts(requirement_list, original_text)
+        if not requirements:
+            return self._empty_result(platform, original_text)
+        
+        # Analyze each requirement in detail
+        # 组件、布局、交互需求按类型分批，每批最多_DETAIL_BATCH_SIZE条，合并为一次模型调用
+        analyze_single = self._single_analyzers
+        # 内容（归一化后）与已分析需求相同的直接复用缓存结果，同一次分析中的重复需求只请求一次
+        self._detail_cache_keys.clear()
+        queued = set()
+        duplicates = []
+        batches = []
+        open_batches = {}
+        for requirement in requirements:
+            if requirement.type not in _DETAIL_KINDS:
+                continue
+            key = (self._prompt_cache_key, self._language_instruction, requirement.type,
+                   _normalize_text(requirement.title + "\n" + requirement.description))
+            if self._apply_cached_detail(requirement, key):
+                continue
+            if key in queued:
+                duplicates.append((requirement, key))
+                continue
+            queued.add(key)
+            self._detail_cache_keys[requirement.id] = key
+            batch = open_batches.get(requirement.type)
+            if batch is None or len(batch) == _DETAIL_BATCH_SIZE:
+                batch = open_batches[requirement.type] = []
+                batches.append(batch)
+            batch.append(requirement)
+        
+        # 多个批次时先全部提交并发请求（不使用流式输出，避免各批次输出交错），再按批次顺序应用结果
+        requests = None
+        if len(batches) > 1:
             try:
-                if hasattr(model, 'generate_stream'):
-                    for chunk in model.generate_stream(prompt):
-                        response += chunk
-                        self.streaming_text_updated.emit(chunk)
-                else:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-            except Exception:
-                response = model.generate(prompt)
-                self.streaming_text_updated.emit(response)
-            
-            # 解析详细需求分析结果并更新需求对象
-            analysis_result = self._parse_detailed_analysis(response)
+                model = self._get_analysis_model()
+                requests = [
+                    self._request_pool.submit(self._generate, model, self._detail_batch_prompt(batch, original_text),
+                                              prompt_cache_key=self._prompt_cache_key)
+                    for batch in batches
+                ]
+            except Exception as e:
+                self.error_occurred.emit(f"Error starting detailed analysis requests: {str(e)}")
+        
+        total_reqs = sum(map(len, batches))
+        detail_template = tr("analyzing_requirement_detail")
+        done = 0
+        last_progress = None
+        
+        for index, batch in enumerate(batches):
+            done += len(batch)
+            title = batch[0].title
+            message = detail_template.format(
+                current=done, total=total_reqs, title=title if len(title) <= 30 else title[:30]
+            )
+            # 百分比未变化时只更新状态文本，不重复发送进度信号
+            progress = 20 + 60 * done // total_reqs
+            if progress != last_progress:
+                last_progress = progress
+                self.update_progress(progress, message)
+            else:
+                self.status_updated.emit(message)
             
-            if analysis_result:
-                self._update_requirement_with_analysis(requirement, analysis_result)
-                requirement.status = RequirementStatus.ANALYZED
-                self.streaming_text_updated.emit("\n" + tr("component_analysis_complete").format(title=requirement.title) + "\n\n")
+            single = analyze_single[batch[0].type]
+            if requests is not None:
+                self._finish_detail_request(batch, requests[index], original_text, single)
+            elif len(batch) == 1:
+                single(batch[0], original_text)
             else:
-                self.streaming_text_updated.emit("\n" + tr("component_analysis_failed").format(title=requirement.title) + "\n\n")
-                
-        except Exception as e:
-            self.error_occurred.emit(f"Error analyzing component {requirement.title}: {str(e)}")
+                self._analyze_detail_batch(batch, original_text, single)
+        
+        for requirement, key in duplicates:
+            if not self._apply_cached_detail(requirement, key):
+                analyze_single[requirement.type](requirement, original_text)
+        
+        # Final validation and scoring
+        self.update_progress(90, tr("validating_requirements"))
+        analysis_result = self._validate_and_score(
+            requirements, "", "", platform, original_text
+        )
+        
+        self.update_progress(100, tr("detailed_analysis_completed"))
+        return analysis_result
+    
+    def _empty_result(self, platform: str, original_text: str) -> AnalysisResult:
+        """Result for a detailed analysis request with no usable requirements"""
+        result = self._validate_and_score([], "", "", platform, original_text)
+        self.update_progress(100, tr("detailed_analysis_completed"))
+        return result
+    
+    def _complete_analysis(self, requirements_text: str, context: str, platform: str, 
+                          existing_analysis: Optional[AnalysisResult]) -> AnalysisResult:
+        """Original complete analysis flow"""
+        self.update_progress(10, tr("starting_requirements_analysis"))
+        
+        # 相互独立的步骤并行执行：流式输出的步骤留在当前线程，另一个步骤在请求线程池中静默运行，
+        # 避免两个流的输出在界面上交错
+        # Step 1: Initial analysis and project overview (background)
+        self.update_progress(20, tr("analyzing_requirements_overview"))
+        overview_future = self._request_pool.submit(self._analyze_project_overview, requirements_text, context, False)
+        
+        # Step 2: Extract and categorize requirements
+        # 每条组件/布局/交互需求一经流式解析即预先发起其分析请求，与提取过程重叠
+        self.update_progress(40, tr("extracting_categorizing_requirements"))
+        self._speculative_requests.clear()
+        requirements = self._extract_requirements(requirements_text, context, platform, speculate=True)
+        project_overview, target_audience = overview_future.result()
+        
+        # 按类型一次性分组，供后续各阶段直接使用
+        by_type = defaultdict(list)
+        for req in requirements:
+            by_type[req.type].append(req)
+        
+        # Step 3 & 4: components and layout/interactions work on disjoint requirements
+        # 布局阶段占用一个请求线程并等待自己提交到同一线程池的请求，其余线程负责执行这些请求
+        self.update_progress(60, tr("analyzing_ui_components_phase"))
+        layout_future = self._request_pool.submit(
+            self._analyze_layout_and_interactions,
+            by_type[RequirementType.LAYOUT], by_type[RequirementType.INTERACTION], requirements_text
+        )
+        self._analyze_components(by_type[RequirementType.UI_COMPONENT], requirements_text)
+        
+        self.update_progress(80, tr("analyzing_layout_interactions"))
+        layout_future.result()
+        
+        # 最终需求列表中没有对应需求的预先请求不再需要；已开始的无法取消，提示浪费的请求数
+        wasted = sum(not request.cancel() for request in self._speculative_requests.values())
+        self._speculative_requests.clear()
+        if wasted:
+            self.status_updated.emit(tr("speculative_requests_unused").format(count=wasted))
+        
+        # Step 5: Validate and score
+        self.update_progress(90, tr("validating_requirements"))
+        analysis_result = self._validate_and_score(
+            requirements, project_overview, target_audience, platform, requirements_text
+        )
+        
+        self.update_progress(100, tr("requirements_analysis_completed"))
+        return analysis_result
+    
+    def _bind_prompts(self, instruction: str) -> Dict[str, str]:
+        """Return the prompt templates with the given language instruction filled in"""
+        bound = self._bound_prompt_cache.get(instruction)
+        if bound is None:
+            bound = {
+                name: template.replace("{language_instruction}", instruction)
+                for name, template in self.prompts.items()
+            }
+            self._bound_prompt_cache[instruction] = bound
+        return bound
+    
+    def _run_prompt(self, model, prompt: str, banner_key: Optional[str] = None,
+                    scanner: Optional[_JsonArrayStream] = None, **kwargs) -> str:
+        """Run a prompt, streaming the response to the UI when the model supports it
+        
+        Falls back to a single generate() call if streaming is unavailable or
+        fails part way. Extra keyword arguments are passed on to the model.
+        Deterministic requests are answered from the shared response cache.
+        """
+        cache_key = None
+        if response_cache.is_cacheable(model, kwargs):
+            cache_key = response_cache.make_key(model, prompt)
+            response = response_cache.get(cache_key)
+            if response is not None:
+                if banner_key:
+                    self.streaming_text_updated.emit(tr(banner_key) + "\n\n")
+                self.streaming_text_updated.emit(response)
+                if scanner is not None:
+                    scanner.feed(response)
+                return response
+        
+        response = None
+        try:
+            if banner_key:
+                self.streaming_text_updated.emit(tr(banner_key) + "\n\n")
+            if hasattr(model, 'generate_stream'):
+                response = self._stream_collect(model, prompt, scanner, **kwargs)
+        except Exception:
+            pass
+        
+        if response is None:
+            # 流式输出不可用或失败，使用普通输出
+            if scanner is not None:
+                scanner.reset()
+            response = model.generate(prompt, **kwargs)
+            self.streaming_text_updated.emit(response)
+        
+        if cache_key is not None:
+            response_cache.put(cache_key, response)
+        return response
     
-    def _analyze_single_layout(self, requirement: Requirement, original_text: str):
-        """Analyze a single layout requirement in detail"""
+    def _generate(self, model, prompt: str, **kwargs) -> str:
+        """Non-streaming model call through the shared response cache"""
+        if not response_cache.is_cacheable(model, kwargs):
+            return model.generate(prompt, **kwargs)
+        cache_key = response_cache.make_key(model, prompt)
+        response = response_cache.get(cache_key)
+        if response is None:
+            response = model.generate(prompt, **kwargs)
+            response_cache.put(cache_key, response)
+        return response
+    
+    def _stream_collect(self, model, prompt: str, scanner: Optional[_JsonArrayStream] = None, **kwargs) -> str:
+        """Stream a model response, forwarding each chunk to the UI, and return the full text
+        
+        When a scanner is given, each chunk is also fed to it so that complete
+        array items are decoded while the stream is still running.
+        """
+        parts = []
         try:
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
-            
-            self.streaming_text_updated.emit(tr("analyzing_layout_detail").format(title=requirement.title) + "\n")
+            for chunk in model.generate_stream(prompt, **kwargs):
+                parts.append(chunk)
+                self._emit_chunk(chunk)
+                if scanner is not None:
+                    scanner.feed(chunk)
+        finally:
+            self._flush_stream()
+        return "".join(parts)
+    
+    def _emit_chunk(self, chunk: str):
+        """Buffer a streamed chunk and forward it in batches to limit signal traffic"""
+        with self._emit_lock:
+            self._emit_buffer.append(chunk)
+            self._emit_size += len(chunk)
+            now = time.monotonic()
+            if self._emit_size >= _STREAM_FLUSH_CHARS or now - self._emit_last > _STREAM_FLUSH_INTERVAL:
+                self._flush_stream_locked(now)
+    
+    def _flush_stream(self):
+        """Emit any buffered streaming text"""
+        with self._emit_lock:
+            self._flush_stream_locked(time.monotonic())
+    
+    def _flush_stream_locked(self, now: float):
+        if self._emit_buffer:
+            text = "".join(self._emit_buffer)
+            self._emit_buffer.clear()
+            self._emit_size = 0
+            self.streaming_text_updated.emit(text)
+        self._emit_last = now
+    
+    def _analyze_project_overview(self, requirements_text: str, context: str, stream: bool = True) -> Tuple[str, str]:
+        """Extract project overview and target audience
+        
+        With stream=False the response is not forwarded to the UI, so the call
+        can run alongside another streaming step.
+        """
+        try:
+            # 使用模块配置指定的模型
+            model = self._get_analysis_model()
             
-            prompt = self.prompts['layout_analysis'].format(
-                language_instruction=self._get_language_instruction(),
-                requirement_description=requirement.description,
-                original_text=original_text
+            prompt = self._bound_prompts[_P_OVERVIEW].format(
+                requirements_text=requirements_text,
+                context=context
             )
             
-            response = ""
+            if not stream:
+                response = self._generate(model, prompt)
+            else:
+                response = self._run_prompt(model, prompt, "analyzing_project_overview")
+                self.streaming_text_updated.emit("\n\n" + "="*50 + "\n\n")
+            
             try:
-                if hasattr(model, 'generate_stream'):
-                    for chunk in model.generate_stream(prompt):
-                        response += chunk
-                        self.streaming_text_updated.emit(chunk)
+                result = _loads(response)
+                # 检查result是否为字典（JSON解码只产生精确的dict/list类型，可直接比较类型）
+                if type(result) is dict:
+                    return result.get('project_overview', ''), result.get('target_audience', '')
+                elif type(result) is list and len(result) > 0:
+                    # 如果返回的是列表，尝试从第一个元素获取信息
+                    first_item = result[0]
+                    if type(first_item) is dict:
+                        return first_item.get('project_overview', ''), first_item.get('target_audience', '')
+                    else:
+                        # 如果列表元素不是字典，使用fallback
+                        return self._extract_overview_fallback(response)
                 else:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-            except Exception:
-                response = model.generate(prompt)
-                self.streaming_text_updated.emit(response)
-            
-            # 解析详细需求分析结果并更新需求对象
-            analysis_result = self._parse_detailed_analysis(response)
-            
-            if analysis_result:
-                self._update_requirement_with_analysis(requirement, analysis_result)
-                requirement.status = RequirementStatus.ANALYZED
-                self.streaming_text_updated.emit("\n" + tr("layout_analysis_complete").format(title=requirement.title) + "\n\n")
-            else:
-                requirement.status = RequirementStatus.INCOMPLETE
-                self.streaming_text_updated.emit("\n" + tr("layout_analysis_failed").format(title=requirement.title) + "\n\n")
+                    # 其他情况使用fallback
+                    return self._extract_overview_fallback(response)
+            except json.JSONDecodeError:
+                # Fallback parsing
+                return self._extract_overview_fallback(response)
                 
         except Exception as e:
-            self.error_occurred.emit(f"Error analyzing layout {requirement.title}: {str(e)}")
+            self.error_occurred.emit(f"Error analyzing project overview: {str(e)}")
+            return "", ""
     
-    def _analyze_single_interaction(self, requirement: Requirement, original_text: str):
-        """Analyze a single interaction requirement in detail"""
+    def _extract_requirements(self, requirements_text: str, context: str, platform: str,
+                              speculate: bool = False) -> List[Requirement]:
+        """Extract individual requirements from text
+        
+        With speculate=True the detail request of each component, layout and
+        interaction requirement starts as soon as it has been streamed.
+        """
         try:
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
-            
-            self.streaming_text_updated.emit(tr("analyzing_interaction_detail").format(title=requirement.title) + "\n")
+            # 使用模块配置指定的模型
+            model = self._get_analysis_model()
             
-            prompt = self.prompts['interaction_analysis'].format(
-                language_instruction=self._get_language_instruction(),
-                requirement_description=requirement.description,
-                original_text=original_text
+            prompt = self._bound_prompts[_P_INITIAL].format(
+                requirements_text=requirements_text,
+                context=context,
+                platform=platform
             )
             
-            response = ""
-            try:
-                if hasattr(model, 'generate_stream'):
-                    for chunk in model.generate_stream(prompt):
-                        response += chunk
-                        self.streaming_text_updated.emit(chunk)
-                else:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-            except Exception:
-                response = model.generate(prompt)
-                self.streaming_text_updated.emit(response)
+            # 流式输出需求提取过程
+            on_item = (lambda item: self._speculate_detail(item, requirements_text)) if speculate else None
+            scanner = _JsonArrayStream(on_item)
+            response = self._run_prompt(model, prompt, "extracting_requirements", scanner=scanner)
             
-            # 解析详细需求分析结果并更新需求对象
-            analysis_result = self._parse_detailed_analysis(response)
+            self.streaming_text_updated.emit("\n\n" + "="*50 + "\n\n")
+            
+            # Parse the response and create Requirement objects
+            return self._requirements_from_stream(scanner, response, requirements_text)
             
-            if analysis_result:
-                self._update_requirement_with_analysis(requirement, analysis_result)
-                requirement.status = RequirementStatus.ANALYZED
-                self.streaming_text_updated.emit("\n" + tr("interaction_analysis_complete").format(title=requirement.title) + "\n\n")
-            else:
-                requirement.status = RequirementStatus.INCOMPLETE
-                self.streaming_text_updated.emit("\n" + tr("interaction_analysis_failed").format(title=requirement.title) + "\n\n")
-                
         except Exception as e:
-            self.error_occurred.emit(f"Error analyzing interaction {requirement.title}: {str(e)}")
+            self.error_occurred.emit(f"Error extracting requirements: {str(e)}")
+            return []
     
-    def _analyze_components(self, requirements: List[Requirement], original_text: str):
-        """Analyze and add component specifications to requirements"""
-        ui_requirements = [req for req in requirements if req.type == RequirementType.UI_COMPONENT]
-        
-        if not ui_requirements:
-            self.streaming_text_updated.emit(tr("no_ui_components_found") + "\n\n")
-            return
-        
+    def _extract_requirements_list(self, requirements_text: str, context: str, platform: str) -> List[Requirement]:
+        """Extract basic requirement list with minimal details for first phase"""
         try:
             # 使用模块配置指定的模型
-            module_config = self.config.get_module_config("requirement_analyzer")
-            model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
+            model = self._get_analysis_model()
             
-            self.streaming_text_updated.emit(tr("analyzing_ui_components").format(count=len(ui_requirements)) + "\n\n")
+            prompt = self._bound_prompts[_P_REQUIREMENT_LIST].format(
+                requirements_text=requirements_text,
+                context=context,
+                platform=platform
+            )
             
-            for i, requirement in enumerate(ui_requirements, 1):
-                self.streaming_text_updated.emit(tr("analyzing_component").format(current=i, total=len(ui_requirements), title=requirement.title) + "\n")
-                
-                prompt = self.prompts['component_extraction'].format(
-                    language_instruction=self._get_language_instruction(),
-                    requirement_title=requirement.title,
-                    requirement_description=requirement.description,
-                    original_text=original_text
-                )
-                
-                response = ""
-                try:
-                    if hasattr(model, 'generate_stream'):
-                        for chunk in model.generate_stream(prompt):
-                            response += chunk
-                            self.streaming_text_updated.emit(chunk)
-                    else:
-                        response = model.generate(prompt)
-                        self.streaming_text_updated.emit(response)
-                except Exception:
-                    response = model.generate(prompt)
-                    self.streaming_text_updated.emit(response)
-                
-                # 解析详细需求分析结果并更新需求对象
-                analysis_result = self._parse_detailed_analysis(response)
-                
-                if analysis_result:
-                    self._update_requirement_with_analysis(requirement, analysis_result)
-                    requirement.status = RequirementStatus.ANALYZED
-                    self.streaming_text_updated.emit("\n" + tr("component_analysis_complete").format(title=requirement.title) + "\n\n")
-                else:
-                    requirement.status = RequirementStatus.INCOMPLETE
-                    self.streaming_text_updated.emit("\n" + tr("component_analysis_failed").format(title=requirement.title) + "\n\n")
-                    # 记录调试信息
-                    self.streaming_text_updated.emit(f"调试信息：AI响应内容：{response[:300]}...\n\n")
+            # 流式输出需求列表提取过程
+            scanner = _JsonArrayStream()
+            response = self._run_prompt(model, prompt, "extracting_requirements_list", scanner=scanner)
+            
+            self.streaming_text_updated.emit("\n\n" + "="*50 + "\n\n")
+            
+            # Parse the response and create basic Requirement objects
+            return self._requirements_from_stream(scanner, response, requirements_text)
             
-            self.streaming_text_updated.emit("="*50 + "\n\n")
-                    
         except Exception as e:
-            self.error_occurred.emit(f"Error analyzing components: {str(e)}")
+            self.error_occurred.emit(f"Error extracting requirements list: {str(e)}")
+            return []
     
-    def _analyze_layout_and_interactions(self, requirements: List[Requirement], original_text: str):
-        """Analyze layout and interaction requirements"""
-        layout_requirements = [req for req in requirements if req.type == RequirementType.LAYOUT]
-        interaction_requirements = [req for req in requirements if req.type == RequirementType.INTERACTION]
-        
-        try:
-            # 使用模块配置指定的模型
+    def _get_analysis_model(self):
+        """Get the model configured for the requirement analyzer, resolved once per process() call"""
+        model = self._model
+        if model is None:
             module_config = self.config.get_module_config("requirement_analyzer")
             model_config_name = module_config.model_config if module_config else self.config.get_app_setting("default_model")
-            model = self.model_factory.get_model(model_config_name)
-            
-            # Analyze layout requirements
-            for requirement in layout_requirements:
-                prompt = self.prompts['layout_analysis'].format(
-                    language_instruction=self._get_language_instruction(),
-                    requirement_description=requirement.description,
-                    original_text=original_text
-                )
-                
-                response = model.generate(prompt)
-                # 解析详细需求分析结果并更新需求对象
-                analysis_result = self._parse_detailed_analysis(response)
-                
-                if analysis_result:
-                    self._update_requirement_with_analysis(requirement, analysis_result)
-            
-            # Analyze interaction requirements
-            for requirement in interaction_requirements:
-                prompt = self.prompts['interaction_analysis'].format(
-                    language_instruction=self._get_language_instruction(),
-                    requirement_description=requirement.description,
-                    original_text=original_text
-                )
-                
-                response = model.generate(prompt)
-                # 解析详细需求分析结果并更新需求对象
-                analysis_result = self._parse_detailed_analysis(response)
-                
-                if analysis_result:
-                    self._update_requirement_with_analysis(requirement, analysis_result)
-                    
-        except Exception as e:
-            self.error_occurred.emit(f"Error analyzing layout and interactions: {str(e)}")
+            model = self._model = self.model_factory.get_model(model_config_name)
+        return model
     
-    def _validate_and_score(self, requirements: List[Requirement], project_overview: str, 
-                           target_audience: str, platform: str, original_text: str) -> AnalysisResult:
-        """Validate requirements and create analysis result with scores"""
-        
-        # Calculate completeness score
-        total_reqs = len(requirements)
-        analyzed_reqs = len([req for req in requirements if req.status == RequirementStatus.ANALYZED])
-        completeness_score = analyzed_reqs / total_reqs if total_reqs > 0 else 0.0
-        
-        # Identify gaps and ambiguities
-        gaps = self._identify_gaps(requirements, original_text)
-        ambiguities = self._identify_ambiguities(requirements)
-        
-        # Calculate clarity score based on ambiguities
-        clarity_score = max(0.0, 1.0 - (len(ambiguities) / max(total_reqs, 1)) * 0.5)
-        
-        # Calculate feasibility score (simplified)
-        feasibility_score = self._calculate_feasibility_score(requirements)
-        
-        # Generate recommendations
-        recommendations = self._generate_recommendations(requirements, gaps, ambiguities)
-        
-        # Estimate development effort
-        total_effort, phases = self._estimate_development_effort(requirements)
-        
-        # Framework recommendations based on requirements
-        framework_recommendations = self._recommend_frameworks(requirements, platform)
-        
-        return AnalysisResult(
-            requirements=requirements,
-            project_overview=project_overview,
-            target_audience=target_audience,
-            platform=platform,
-            framework_recommendations=framework_recommendations,
-            completeness_score=completeness_score,
-            clarity_score=clarity_score,
-            feasibility_score=feasibility_score,
-            gaps=gaps,
-            ambiguities=ambiguities,
-            recommendations=recommendations,
-            total_estimated_effort=total_effort,
-            development_phases=phases
+    def _detail_batch_prompt(self, batch: List[Requirement], original_text: str) -> str:
+        """Build the batched detail analysis prompt for requirements of one type"""
+        batch_prompt, _ = _DETAIL_KINDS[batch[0].type]
+        requirement_items = "\n        ".join(
+            f"{i}. {requirement.title}: {requirement.description}"
+            for i, requirement in enumerate(batch, 1)
+        )
+        return self._bound_prompts[batch_prompt].format(
+            original_text=self._relevant_context(original_text, requirement_items),
+            requirement_items=requirement_items
         )
     
-    def _parse_requirements_response(self, response: str, original_text: str) -> List[Requirement]:
-        """Parse AI response into Requirement objects"""
-        requirements = []
+    def _single_detail_prompt(self, template: str, title: str, description: str, original_text: str) -> str:
+        """Build a single-requirement component/layout/interaction analysis prompt"""
+        return self._bound_prompts[template].format(
+            requirement_title=title,
+            requirement_description=description,
+            original_text=self._relevant_context(original_text, title + "\n" + description)
+        )
+    
+    def _relevant_context(self, original_text: str, query: str) -> str:
+        """Clip a long requirements document to the sentences most relevant to query
         
+        Documents within _DETAIL_CONTEXT_CHARS are returned unchanged, so every
+        prompt of an analysis shares the same prefix.
+        """
+        if len(original_text) <= _DETAIL_CONTEXT_CHARS:
+            return original_text
+        
+        # 文档切句与检索词只计算一次，同一次分析内复用
+        index = self._context_index
+        if index is None or index[0] is not original_text:
+            sentences = [s for s in _CONTEXT_SENTENCE_RE.findall(original_text) if s.strip()]
+            index = self._context_index = (original_text, sentences, [_context_terms(s) for s in sentences])
+        _, sentences, sentence_terms = index
+        
+        query_terms = _context_terms(query)
+        ranked = sorted(
+            (i for i, terms in enumerate(sentence_terms) if terms & query_terms),
+            key=lambda i: len(sentence_terms[i] & query_terms),
+            reverse=True
+        )
+        selected = []
+        size = 0
+        for i in ranked:
+            size += len(sentences[i])
+            if size > _DETAIL_CONTEXT_CHARS:
+                break
+            selected.append(i)
+        if not selected:
+            return original_text[:_DETAIL_CONTEXT_CHARS]
+        # 按文档原顺序拼接
+        selected.sort()
+        return "".join(sentences[i] for i in selected)
+    
+    def _apply_cached_detail(self, requirement: Requirement, key: Tuple) -> bool:
+        """Apply a cached detail analysis to the requirement; return False if there is none"""
+        analysis_result = self._detail_cache.get(key)
+        if analysis_result is None:
+            return False
+        self.streaming_text_updated.emit(tr("reusing_cached_analysis") + "\n")
+        self._update_requirement_with_analysis(requirement, analysis_result)
+        requirement.status = RequirementStatus.ANALYZED
+        return True
+    
+    def _emit_detail_banners(self, batch: List[Requirement]):
+        """Announce the requirements of a batch in the streamed output"""
+        _, kind = _DETAIL_KINDS[batch[0].type]
+        banner = tr("analyzing_" + kind + "_detail")
+        for requirement in batch:
+            self.streaming_text_updated.emit(banner.format(title=requirement.title) + "\n")
+    
+    def _analyze_detail_batch(self, batch: List[Requirement], original_text: str, analyze_single):
+        """Analyze several requirements of the same type with a single streamed model call"""
+        analyses = {}
         try:
-            # 清理响应，移除markdown代码块标记
-            cleaned_response = response.strip()
-            
-            # 移除 ```json 和 ``` 标记
-            if cleaned_response.startswith('```json'):
-                cleaned_response = cleaned_response[7:]  # 移除 ```json
-            elif cleaned_response.startswith('```'):
-                cleaned_response = cleaned_response[3:]   # 移除 ```
-            
-            if cleaned_response.endswith('```'):
-                cleaned_response = cleaned_response[:-3]  # 移除结尾的 ```
-            
-            cleaned_response = cleaned_response.strip()
-            
-            # Try to parse as JSON first
-            if cleaned_response.startswith('{') or cleaned_response.startswith('['):
-                data = json.loads(cleaned_response)
-                
-                # 处理不同的数据结构
-                if isinstance(data, dict):
-                    if 'requirements' in data:
-                        data = data['requirements']
-                    else:
-                        # 如果是单个需求对象的字典，包装成列表
-                        data = [data]
-                elif isinstance(data, list):
-                    # 已经是列表，直接使用
-                    pass
-                else:
-                    # 不支持的数据类型，使用fallback
-                    requirements = self._parse_requirements_text(cleaned_response, original_text)
-                    return requirements
-                
-                # 确保data是列表
-                if not isinstance(data, list):
-                    data = [data]
-                
-                for item in data:
-                    req = self._create_requirement_from_dict(item, original_text)
-                    if req:
-                        requirements.append(req)
-            else:
-                # Fallback to text parsing
-                requirements = self._parse_requirements_text(cleaned_response, original_text)
-                
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
-            # Fallback to text parsing
-            self.error_occurred.emit(f"JSON parsing failed: {str(e)}, using text parsing fallback")
-            requirements = self._parse_requirements_text(response, original_text)
+            model = self._get_analysis_model()
+            self._emit_detail_banners(batch)
+            prompt = self._detail_batch_prompt(batch, original_text)
+            scanner = _JsonArrayStream()
+            response = self._run_prompt(model, prompt, scanner=scanner, prompt_cache_key=self._prompt_cache_key)
+            analyses = self._parse_detailed_batch(response, scanner)
+        except Exception as e:
+            self.error_occurred.emit(f"Error analyzing {_DETAIL_KINDS[batch[0].type][1]} batch: {str(e)}")
         
-        return requirements
+        self._apply_detail_batch(batch, analyses, original_text, analyze_single)
     
-    def _create_requirement_from_dict(self, data: Dict[str, Any], source: str) -> Optional[Requirement]:
-        """Create a Requirement object from dictionary data"""
+    def _finish_detail_request(self, batch: List[Requirement], request: Future, original_text: str,
+                               analyze_single):
+        """Wait for a concurrently submitted batch request and apply its result"""
+        analyses = {}
+        self._emit_detail_banners(batch)
         try:
-            # 首先检查data是否为字典类型
-            if not isinstance(data, dict):
-                self.error_occurred.emit(f"Expected dict but got {type(data).__name__}: {data}")
-                return None
-            
-            req_type = RequirementType(data.get('type', 'functional'))
-            priority = RequirementPriority(data.get('priority', 'medium'))
-            
-            return Requirement(
-                title=data.get('title', ''),
-                description=data.get('description', ''),
-                type=req_type,
-                priority=priority,
-                source=source,
-                rationale=data.get('rationale', ''),
-                acceptance_criteria=data.get('acceptance_criteria', []),
-                estimated_effort=data.get('estimated_effort'),
-                tags=data.get('tags', [])
-            )
-        except (ValueError, KeyError) as e:
-            self.error_occurred.emit(f"Error creating requirement: {str(e)}")
-            return None
-    
-    def _parse_requirements_text(self, response: str, source: str) -> List[Requirement]:
-        """Fallback text parsing for requirements"""
-        requirements = []
-        
-        # Simple pattern matching for requirement-like text
-        lines = response.split('\n')
-        current_req = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Look for numbered items or bullet points
-            if re.match(r'^\d+\.', line) or line.startswith('- ') or line.startswith('* '):
-                if current_req:
-                    requirements.append(current_req)
-                
-                title = re.sub(r'^\d+\.|^[-*]\s*', '', line).strip()
-                current_req = Requirement(
-                    title=title,
-                    description=title,
-                    source=source
-                )
-            elif current_req and line:
-                # Add to description
-                current_req.description += ' ' + line
-        
-        if current_req:
-            requirements.append(current_req)
+            response = request.result()
+            self.streaming_text_updated.emit(response)
+            analyses = self._parse_detailed_batch(response)
+        except Exception as e:
+            self.error_occurred.emit(f"Error analyzing {_DETAIL_KINDS[batch[0].type][1]} batch: {str(e)}")
         
-        return requirements
+        self._apply_detail_batch(batch, analyses, original_text, analyze_single)
     
-    def _parse_component_spec(self, response: str) -> Optional[ComponentSpec]:
-        """Parse component specification from AI response"""
-        try:
-            # 清理响应，移除markdown代码块标记
-            cleaned_response = response.strip()
-            
-            # 移除 ```json 和 ``` 标记
-            if cleaned_response.startswith('```json'):
-                cleaned_response = cleaned_response[7:]  # 移除 ```json
-            elif cleaned_response.startswith('```'):
-                cleaned_response = cleaned_response[3:]   # 移除 ```
-            
-            if cleaned_response.endswith('```'):
-                cleaned_response = cleaned_response[:-3]  # 移除结尾的 ```
+    def _apply_detail_batch(self, batch: List[Requirement], analyses: Dict[int, Dict[str, Any]],
+                            original_text: str, analyze_single):
+        """Apply batched analysis results; requirements missing from them are analyzed one at a time"""
+        _, kind = _DETAIL_KINDS[batch[0].type]
+        complete_template = tr(kind + "_analysis_complete")
+        now = datetime.now()
+        for i, requirement in enumerate(batch, 1):
+            analysis_result = analyses.get(i)
+            if analysis_result:
+                self._update_requirement_with_analysis(requirement, analysis_result, now)
+                requirement.status = RequirementStatus.ANALYZED
+                self.streaming_text_updated.emit("\n" + complete_template.format(title=requirement.title) + "\n\n")
+            else:
+                # 批量响应中缺少该需求的结果，单独重新分析
+                analyze_single(requirement, original_text)
+    
+    def _analyze_single_component(self, requirement: Requirement, original_text: str):
+        """Analyze a single UI component requirement in detail"""
+        try:
+            model = self._get_analysis_model()
             
-            cleaned_response = cleaned_response.strip()
+            self.streaming_text_updated.emit(tr("analyzing_component_detail").format(title=requirement.title) + "\n")
             
-            # 处理单个对象
-            if cleaned_response.startswith('{'):
-                data = json.loads(cleaned_response)
-                return self._create_component_spec_from_data(data)
+            prompt = self._single_detail_prompt(_P_COMPONENT, requirement.title, requirement.description,
+                                                original_text)
             
-            # 处理数组格式 - 通常取第一个主要组件
-            elif cleaned_response.startswith('['):
-                data_array = json.loads(cleaned_response)
-                if isinstance(data_array, list) and len(data_array) > 0:
-                    # 如果是数组，尝试找到主要组件（通常是第一个）
-                    main_component = data_array[0]
-                    
-                    # 创建主组件规格
-                    component_spec = self._create_component_spec_from_data(main_component)
-                    
-                    # 如果有子组件，将其作为children添加
-                    if len(data_array) > 1:
-                        for child_data in data_array[1:]:
-                            child_spec = self._create_component_spec_from_data(child_data)
-                            if child_spec:
-                                component_spec.children.append(child_spec)
-                    
-                    return component_spec
+            response = self._run_prompt(model, prompt, prompt_cache_key=self._prompt_cache_key)
             
-            # 尝试从文本中提取组件信息（fallback）
-            return self._parse_component_spec_fallback(cleaned_response)
+            # 解析详细需求分析结果并更新需求对象
+            analysis_result = self._parse_detailed_analysis(response)
             
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            # 如果JSON解析失败，尝试文本解析
-            fallback_result = self._parse_component_spec_fallback(response)
-            if fallback_result is None:
-                # 如果fallback也失败，记录错误
-                self.error_occurred.emit(f"Component spec parsing failed: {str(e)}")
-            return fallback_result
+            if analysis_result:
+                self._update_requirement_with_analysis(requirement, analysis_result)
+                requirement.status = RequirementStatus.ANALYZED
+                self.streaming_text_updated.emit("\n" + tr("component_analysis_complete").format(title=requirement.title) + "\n\n")
+            else:
+                self.streaming_text_updated.emit("\n" + tr("component_analysis_failed").format(title=requirement.title) + "\n\n")
+                
         except Exception as e:
-            # 记录错误但不中断流程
-            self.error_occurred.emit(f"Component spec parsing error: {str(e)}")
-            return None
-    
-    def _create_component_spec_from_data(self, data: Dict[str, Any]) -> ComponentSpec:
-        """从数据字典创建ComponentSpec对象"""
-        # 处理children字段
-        children = []
-        if 'children' in data:
-            children_data = data['children']
-            if isinstance(children_data, list):
-                for child_name in children_data:
-                    # 如果children是字符串数组，创建简单的子组件
-                    if isinstance(child_name, str):
-                        children.append(ComponentSpec(
-                            name=child_name,
-                            type="reference",  # 标记为引用类型
-                            properties={}
-                        ))
-                    elif isinstance(child_name, dict):
-                        children.append(self._create_component_spec_from_data(child_name))
-        
-        return ComponentSpec(
-            name=data.get('name', 'UnknownComponent'),
-            type=data.get('type', 'unknown'),
-            properties=data.get('properties', {}),
-            children=children,
-            events=data.get('events', []),
-            validation=data.get('validation'),
-            accessibility=data.get('accessibility')
-        )
+            self.error_occurred.emit(f"Error analyzing component {requirement.title}: {str(e)}")
     
-    def _parse_component_spec_fallback(self, response: str) -> Optional[ComponentSpec]:
-        """从非结构化文本中解析组件规格（fallback方法）"""
+    def _analyze_single_layout(self, requirement: Requirement, original_text: str):
+        """Analyze a single layout requirement in detail"""
         try:
-            # 基本的文本解析逻辑
-            lines = response.split('\n')
-            component_name = None
-            component_type = None
-            properties = {}
-            events = []
-            found_valid_content = False
+            model = self._get_analysis_model()
             
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # 查找组件名称
-                if '"name"' in line or 'name:' in line:
-                    # 简单的名称提取
-                    if ':' in line:
-                        component_name = line.split(':')[-1].strip().strip('"\'')
-                        found_valid_content = True
-                
-                # 查找组件类型
-                if '"type"' in line or 'type:' in line:
-                    if ':' in line:
-                        component_type = line.split(':')[-1].strip().strip('"\'')
-                        found_valid_content = True
-                
-                # 查找事件
-                if 'event' in line.lower() and ('[' in line or 'click' in line or 'hover' in line):
-                    # 简单的事件提取
-                    if 'click' in line:
-                        events.append('click')
-                        found_valid_content = True
-                    if 'hover' in line:
-                        events.append('hover')
-                        found_valid_content = True
-                    if 'submit' in line:
-                        events.append('submit')
-                        found_valid_content = True
+            self.streaming_text_updated.emit(tr("analyzing_layout_detail").format(title=requirement.title) + "\n")
             
-            # 只有找到有效内容才返回组件
-            if found_valid_content and component_name and component_type:
-                return ComponentSpec(
-                    name=component_name,
-                    type=component_type,
-                    properties=properties,
-                    events=events,
-                    validation=None,
-                    accessibility=None
-                )
-        
-        except Exception:
-            pass
-        
-        return None
-    
-    def _parse_layout_spec(self, response: str) -> Optional[LayoutSpec]:
-        """Parse layout specification from AI response"""
-        try:
-            # 清理响应文本
-            cleaned_response = self._clean_json_response(response)
+            prompt = self._single_detail_prompt(_P_LAYOUT, requirement.title, requirement.description,
+                                                original_text)
             
-            if cleaned_response.startswith('{'):
-                data = json.loads(cleaned_response)
-                return LayoutSpec(
-                    type=data.get('type', 'flow'),
-                    sections=data.get('sections', []),
-                    responsive=data.get('responsive', True),
-                    breakpoints=data.get('breakpoints'),
-                    spacing=data.get('spacing'),
-                    alignment=data.get('alignment')
-                )
-            else:
-                # 尝试从文本中提取JSON
-                json_match = re.search(r'\{.*\}', cleaned_response, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group())
-                    return LayoutSpec(
-                        type=data.get('type', 'flow'),
-                        sections=data.get('sections', []),
-                        responsive=data.get('responsive', True),
-                        breakpoints=data.get('breakpoints'),
-                        spacing=data.get('spacing'),
-                        alignment=data.get('alignment')
-                    )
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            # 记录错误但不抛出异常
-            print(f"Layout parsing error: {e}, response: {response[:200]}...")
-        
-        return None
-
-    def _parse_interaction_specs(self, response: str) -> List[InteractionSpec]:
-        """Parse interaction specifications from AI response"""
-        specs = []
-        
-        try:
-            # 清理响应文本
-            cleaned_response = self._clean_json_response(response)
+            response = self._run_prompt(model, prompt, prompt_cache_key=self._prompt_cache_key)
             
-            data = None
+            # 解析详细需求分析结果并更新需求对象
+            analysis_result = self._parse_detailed_analysis(response)
             
-            if cleaned_response.startswith('['):
-                data = json.loads(cleaned_response)
-            elif cleaned_response.startswith('{'):
-                parsed_obj = json.loads(cleaned_response)
-                if 'interactions' in parsed_obj:
-                    data = parsed_obj['interactions']
-                elif isinstance(parsed_obj, dict) and any(key in parsed_obj for key in ['trigger', 'action', 'target']):
-                    # 单个交互对象
-                    data = [parsed_obj]
+            if analysis_result:
+                self._update_requirement_with_analysis(requirement, analysis_result)
+                requirement.status = RequirementStatus.ANALYZED
+                self.streaming_text_updated.emit("\n" + tr("layout_analysis_complete").format(title=requirement.title) + "\n\n")
             else:
-                # 尝试从文本中提取JSON数组
-                json_match = re.search(r'\[.*\]', cleaned_response, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group())
-                else:
-                    # 尝试提取JSON对象
-                    json_match = re.search(r'\{.*\}', cleaned_response, re.DOTALL)
-                    if json_match:
-                        parsed_obj = json.loads(json_match.group())
-                        if isinstance(parsed_obj, dict) and any(key in parsed_obj for key in ['trigger', 'action', 'target']):
-                            data = [parsed_obj]
-            
-            if data and isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        spec = InteractionSpec(
-                            trigger=item.get('trigger', ''),
-                            action=item.get('action', ''),
-                            target=item.get('target', ''),
-                            conditions=item.get('conditions', []),
-                            feedback=item.get('feedback'),
-                            validation=item.get('validation')
-                        )
-                        specs.append(spec)
+                requirement.status = RequirementStatus.INCOMPLETE
+                self.streaming_text_updated.emit("\n" + tr("layout_analysis_failed").format(title=requirement.title) + "\n\n")
                 
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            # 记录错误但不抛出异常
-            print(f"Interaction parsing error: {e}, response: {response[:200]}...")
-        
-        return specs
-
-    def _clean_json_response(self, response: str) -> str:
-        """清理AI响应文本，移除markdown代码块标记和其他干扰内容"""
-        if not response:
-            return ""
-        
-        # 移除开头和结尾的空白
-        cleaned = response.strip()
-        
-        # 移除markdown代码块标记
-        if cleaned.startswith('```json'):
-            cleaned = cleaned[7:]
-        elif cleaned.startswith('```'):
-            cleaned = cleaned[3:]
-        
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]
-        
-        # 移除其他可能的前缀/后缀
-        prefixes_to_remove = [
-            '分析结果：', '分析结果:', 'Result:', 'result:', 
-            '布局分析：', '布局分析:', 'Layout:', 'layout:',
-            '交互分析：', '交互分析:', 'Interaction:', 'interaction:',
-            'JSON:', 'json:', 'JSON格式：', 'JSON格式:'
-        ]
-        
-        for prefix in prefixes_to_remove:
-            if cleaned.startswith(prefix):
-                cleaned = cleaned[len(prefix):].strip()
-                break
-        
-        # 清理结尾的说明文字
-        suffixes_to_remove = [
-            '以上是分析结果', '分析完成', 'Analysis complete', 'analysis complete'
-        ]
-        
-        for suffix in suffixes_to_remove:
-            if cleaned.endswith(suffix):
-                cleaned = cleaned[:-len(suffix)].strip()
-                break
-        
-        # 修复中文引号问题 - 智能处理嵌套引号
-        cleaned = self._fix_chinese_quotes(cleaned)
-        
-        # 尝试提取纯JSON部分
-        cleaned = self._extract_json_part(cleaned)
-        
-        return cleaned.strip()
-    
-    def _extract_json_part(self, text: str) -> str:
-        """从文本中提取JSON部分"""
-        import re
-        
-        # 如果已经是纯JSON，直接返回
-        if (text.startswith('{') and text.endswith('}')) or (text.startswith('[') and text.endswith(']')):
-            return text
-        
-        # 尝试提取JSON对象
-        json_obj_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_obj_match:
-            return json_obj_match.group().strip()
-        
-        # 尝试提取JSON数组
-        json_arr_match = re.search(r'\[.*\]', text, re.DOTALL)
-        if json_arr_match:
-            return json_arr_match.group().strip()
-        
-        return text
-    
-    def _fix_chinese_quotes(self, text: str) -> str:
-        """智能修复中文引号问题"""
-        import re
-        
-        # 先统一转换所有中文引号为英文引号
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        # 处理JSON中的控制字符
-        # 移除或替换不合法的控制字符
-        text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-        # 规范化多个空格为单个空格
-        text = re.sub(r'\s+', ' ', text)
-        
-        # 专门修复常见的嵌套引号问题
-        # 直接字符串替换方式修复已知问题
-        text = text.replace(
-            '"在输入框下方显示红色提示"任务内容不能为空""',
-            '"在输入框下方显示红色提示\\"任务内容不能为空\\""'
-        )
-        
-        return text
-    
-    def _identify_gaps(self, requirements: List[Requirement], original_text: str) -> List[str]:
-        """Identify missing information in requirements"""
-        gaps = []
-        
-        # Check for common missing elements
-        has_ui_components = any(req.type == RequirementType.UI_COMPONENT for req in requirements)
-        has_layout = any(req.type == RequirementType.LAYOUT for req in requirements)
-        has_styling = any(req.type == RequirementType.STYLING for req in requirements)
-        has_interactions = any(req.type == RequirementType.INTERACTION for req in requirements)
-        
-        language = self.config.get_app_setting("language", "zh_CN")
-        
-        if not has_ui_components:
-            gaps.append(tr("gap_no_ui_components"))
-        if not has_layout:
-            gaps.append(tr("gap_no_layout"))
-        if not has_styling:
-            gaps.append(tr("gap_no_styling"))
-        if not has_interactions:
-            gaps.append(tr("gap_no_interactions"))
-        
-        # Check for incomplete requirements
-        for req in requirements:
-            if not req.description.strip():
-                gaps.append(tr("gap_missing_description").format(title=req.title))
-            if not req.acceptance_criteria:
-                gaps.append(tr("gap_missing_acceptance_criteria").format(title=req.title))
-        
-        return gaps
+        except Exception as e:
+            self.error_occurred.emit(f"Error analyzing layout {requirement.title}: {str(e)}")
     
-    def _identify_ambiguities(self, requirements: List[Requirement]) -> List[str]:
-        """Identify ambiguous or unclear requirements"""
-        ambiguities = []
-        language = self.config.get_app_setting("language", "zh_CN")
-        
-        # Look for vague language
-        vague_words_en = ['somehow', 'maybe', 'probably', 'might', 'could', 'should probably']
-        vague_words_zh = ['可能', '也许', '大概', '或许', '应该可能', '某种程度上']
-        
-        for req in requirements:
-            text = (req.title + ' ' + req.description).lower()
-            
-            # Check English vague words
-            for word in vague_words_en:
-                if word in text:
-                    ambiguities.append(tr("ambiguity_vague_language").format(title=req.title, word=word))
-                    req.status = RequirementStatus.AMBIGUOUS
-                    break
+    def _analyze_single_interaction(self, requirement: Requirement, original_text: str):
+        """Analyze a single interaction requirement in detail"""
+        try:
+            model = self._get_analysis_model()
             
-            # Check Chinese vague words
-            for word in vague_words_zh:
-                if word in text:
-                    ambiguities.append(tr("ambiguity_vague_language").format(title=req.title, word=word))
-                    req.status = RequirementStatus.AMBIGUOUS
-                    break
+            self.streaming_text_updated.emit(tr("analyzing_interaction_detail").format(title=requirement.title) + "\n")
             
-            # Check for contradictory requirements
-            if ('simple' in text and 'complex' in text) or ('简单' in text and '复杂' in text):
-                ambiguities.append(tr("ambiguity_contradictory").format(title=req.title))
-        
-        return ambiguities
-    
-    def _calculate_feasibility_score(self, requirements: List[Requirement]) -> float:
-        """Calculate feasibility score based on requirements complexity"""
-        if not requirements:
-            return 1.0
-        
-        total_score = 0.0
-        
-        for req in requirements:
-            # Simple scoring based on requirement type and complexity
-            base_score = 1.0
+            prompt = self._single_detail_prompt(_P_INTERACTION, requirement.title, requirement.description,
+                                                original_text)
             
-            if req.type == RequirementType.FUNCTIONAL:
-                base_score = 0.9
-            elif req.type == RequirementType.UI_COMPONENT:
-                base_score = 0.95
-            elif req.type == RequirementType.PERFORMANCE:
-                base_score = 0.7
-            elif req.type == RequirementType.ACCESSIBILITY:
-                base_score = 0.8
+            response = self._run_prompt(model, prompt, prompt_cache_key=self._prompt_cache_key)
             
-            # Adjust based on priority (critical requirements might be more complex)
-            if req.priority == RequirementPriority.CRITICAL:
-                base_score *= 0.9
-            elif req.priority == RequirementPriority.LOW:
-                base_score *= 1.1
+            # 解析详细需求分析结果并更新需求对象
+            analysis_result = self._parse_detailed_analysis(response)
             
-            total_score += base_score
-        
-        return min(1.0, total_score / len(requirements))
-    
-    def _generate_recommendations(self, requirements: List[Requirement], gaps: List[str], 
-                                ambiguities: List[str]) -> List[str]:
-        """Generate recommendations for improving requirements"""
-        recommendations = []
-        language = self.config.get_app_setting("language", "zh_CN")
-        
-        if gaps:
-            recommendations.append(tr("recommendation_address_gaps"))
-        
-        if ambiguities:
-            recommendations.append(tr("recommendation_clarify_ambiguities"))
-        
-        # Check requirement balance
-        critical_count = len([req for req in requirements if req.priority == RequirementPriority.CRITICAL])
-        total_count = len(requirements)
-        
-        if critical_count > total_count * 0.5:
-            recommendations.append(tr("recommendation_reduce_critical"))
-        
-        if critical_count == 0:
-            recommendations.append(tr("recommendation_identify_critical"))
-        
-        return recommendations
-    
-    def _get_language_instruction(self) -> str:
-        """Get language instruction for AI prompts based on user's language setting"""
-        language = self.config.get_app_setting("language", "zh_CN")
-        
-        if language == "zh_CN":
-            return "请用中文回答。"
-        elif language == "en_US":
-            return "Please respond in English."
-        else:
-            return "Please respond in English."
+            if analysis_result:
+                self._update_requirement_with_analysis(requirement, analysis_result)
+                requirement.status = RequirementStatus.ANALYZED
+                self.streaming_text_updated.emit("\n" + tr("interaction_analysis_complete").format(title=requirement.title) + "\n\n")
+            else:
+                requirement.status = RequirementStatus.INCOMPLETE
+                self.streaming_text_updated.emit("\n" + tr("interaction_analysis_failed").format(title=requirement.title) + "\n\n")
+                
+        except Exception as e:
+            self.error_occurred.emit(f"Error analyzing interaction {requirement.title}: {str(e)}")
     
-    def _estimate_development_effort(self, requirements: List[Requirement]) -> Tuple[str, List[Dict[str, Any]]]:
-        """Estimate development effort and phases"""
-        # Simple effort estimation based on requirement types and priorities
-        effort_points = 0
+    def _analyze_components(self, ui_requirements: List[Requirement], original_text: str):
+        """Analyze and add component specifications to UI component requirements"""
+        if not ui_requirements:
+            self.streaming_text_updated.emit(tr("no_ui_components_found") + "\n\n")
+            return
         
-        for req in requirements:
-            base_points = 1
+        try:
+            # 使用模块配置指定的模型
+            model = self._get_analysis_model()
             
-            if req.type == RequirementType.UI_COMPONENT:
-                base_points = 2
-            elif req.type == RequirementType.LAYOUT:
-                base_points = 3
-            elif req.type == RequirementType.INTERACTION:
-                base_points = 2
-            elif req.type == RequirementType.PERFORMANCE:
-                base_points = 4
+            self.streaming_text_updated.emit(tr("analyzing_ui_components").format(count=len(ui_requirements)) + "\n\n")
             
-            # Adjust for priority
-            if req.priority == RequirementPriority.CRITICAL:
-                base_points *= 1.5
-            elif req.priority == RequirementPriority.HIGH:
-                base_points *= 1.2
+            # 内容完全相同的需求只请求一次
+            local_cache: Dict[bytes, str] = {}
+            prompts = []
+            for requirement in ui_requirements:
+                prompt = self._single_detail_prompt(_P_COMPONENT, requirement.title, requirement.description,
+                                                    original_text)
+                prompts.append((prompt, hashlib.sha1(prompt.encode("utf-8")).digest()))
             
-            effort_points += base_points
-        
-        # Convert to effort estimate
-        if effort_points <= 10:
-            total_effort = "S (Small - 1-2 weeks)"
-        elif effort_points <= 25:
-            total_effort = "M (Medium - 3-4 weeks)"
-        elif effort_points <= 50:
-            total_effort = "L (Large - 1-2 months)"
-        else:
-            total_effort = "XL (Extra Large - 2+ months)"
-        
-        # Create development phases
-        phases = [
-            {
-                "name": "Foundation",
-                "description": "Core setup and critical components",
-                "requirements": [req.id for req in requirements if req.priority == RequirementPriority.CRITICAL],
-                "estimated_duration": "20-30% of total effort"
-            },
-            {
-                "name": "Core Features",
-                "description": "Main functionality implementation",
-                "requirements": [req.id for req in requirements if req.priority == RequirementPriority.HIGH],
-                "estimated_duration": "40-50% of total effort"
-            },
-            {
-                "name": "Enhancement",
-                "description": "Additional features and polish",
-                "requirements": [req.id for req in requirements if req.priority in [RequirementPriority.MEDIUM, RequirementPriority.LOW]],
-                "estimated_duration": "20-30% of total effort"
-            }
-        ]
-        
-        return total_effort, phases
-    
-    def _recommend_frameworks(self, requirements: List[Requirement], platform: str) -> List[str]:
-        """Recommend frameworks based on requirements and platform"""
-        recommendations = []
-        
-        if platform == 'web':
-            has_complex_interactions = any(
-                req.type == RequirementType.INTERACTION and len(req.interaction_specs) > 2
-                for req in requirements
-            )
+            # 多个不同的请求时全部并发提交，按顺序等待并输出结果；只有一个请求时直接流式输出
+            requests = self._submit_requests(model, prompts)
             
-            has_many_components = len([req for req in requirements if req.type == RequirementType.UI_COMPONENT]) > 10
+            for i, (requirement, (prompt, key)) in enumerate(zip(ui_requirements, prompts), 1):
+                self.streaming_text_updated.emit(tr("analyzing_component").format(current=i, total=len(ui_requirements), title=requirement.title) + "\n")
+                
+                # 单个请求失败只影响当前需求，其余需求继续分析
+                try:
+                    response = local_cache.get(key)
+                    if response is not None:
+                        self.streaming_text_updated.emit(tr("reusing_cached_analysis") + "\n")
+                    elif requests:
+                        try:
+                            response = requests[key].result()
+                            self.streaming_text_updated.emit(response)
+                        except Exception:
+                            # 并发请求失败或超时，在当前线程重试一次
+                            response = self._run_prompt(model, prompt, prompt_cache_key=self._prompt_cache_key)
+                        local_cache[key] = response
+                    else:
+                        response = local_cache[key] = self._run_prompt(
+                            model, prompt, prompt_cache_key=self._prompt_cache_key
+                        )
+                except Exception as e:
+                    requirement.status = RequirementStatus.INCOMPLETE
+                    self.error_occurred.emit(f"Error analyzing component {requirement.title}: {str(e)}")
+                    continue
+                
+                # 解析详细需求分析结果并更新需求对象
+                analysis_result = self._parse_detailed_analysis(response)
+                
+                if analysis_result:
+                    self._update_requirement_with_analysis(requirement, analysis_result)
+                    requirement.status = RequirementStatus.ANALYZED
+                    self.streaming_text_updated.emit("\n" + tr("component_analysis_complete").format(title=requirement.title) + "\n\n")
+                else:
+                    requirement.status = RequirementStatus.INCOMPLETE
+                    self.streaming_text_updated.emit("\n" + tr("component_analysis_failed").format(title=requirement.title) + "\n\n")
+                    # 记录调试信息（仅调试模式）
+                    if self.config.get_app_setting("debug", False):
+                        self.streaming_text_updated.emit(f"调试信息：AI响应内容：{response[:300]}...\n\n")
             
-            if has_complex_interactions or has_many_components:
-                recommendations.extend(['React', 'Vue.js', 'Angular'])
-            else:
-                recommendations.extend(['HTML/CSS/JavaScript', 'Alpine.js', 'Svelte'])
+            self.streaming_text_updated.emit("="*50 + "\n\n")
+                    
+        except Exception as e:
+            self.error_occurred.emit(f"Error analyzing components: {str(e)}")
+    
+    def _analyze_layout_and_interactions(self, layout_requirements: List[Requirement],
+                                         interaction_requirements: List[Requirement], original_text: str):
+        """Analyze layout and interaction requirements"""
+        pending: Deque[Tuple[Requirement, Future]] = deque()
+        try:
+            # 使用模块配置指定的模型
+            model = self._get_analysis_model()
+            
+            # Analyze layout requirements, then interaction requirements
+            work = []
+            for template, group in ((_P_LAYOUT, layout_requirements), (_P_INTERACTION, interaction_requirements)):
+                for requirement in group:
+                    prompt = self._single_detail_prompt(template, requirement.title, requirement.description,
+                                                        original_text)
+                    work.append((requirement, prompt, hashlib.sha1(prompt.encode("utf-8")).digest()))
+            
+            # 描述相同的需求会生成相同的提示，只请求一次；不同的请求全部并发提交
+            requests = self._submit_requests(model, [(prompt, key) for _, prompt, key in work])
+            local_cache: Dict[bytes, str] = {}
+            
+            for requirement, prompt, key in work:
+                response = local_cache.get(key)
+                if response is None:
+                    # 单个请求失败只影响当前需求，其余需求继续分析
+                    try:
+                        if requests:
+                            try:
+                                response = requests[key].result()
+                            except Exception:
+                                # 并发请求失败或超时，在当前线程重试一次；本阶段与组件分析同时进行，
+                                # 不使用流式输出，以免与组件分析的输出交错
+                                response = self._generate(model, prompt, prompt_cache_key=self._prompt_cache_key)
+                        else:
+                            response = self._generate(model, prompt, prompt_cache_key=self._prompt_cache_key)
+                    except Exception as e:
+                        self.error_occurred.emit(f"Error analyzing requirement {requirement.title}: {str(e)}")
+                        continue
+                    local_cache[key] = response
+                
+                # 后台解析响应，同时等待下一个请求
+                pending.append((requirement, self._parse_pool.submit(self._parse_detailed_analysis, response)))
+                self._apply_parsed(pending, _PARSE_AHEAD)
+                    
+        except Exception as e:
+            self.error_occurred.emit(f"Error analyzing layout and interactions: {str(e)}")
+        finally:
+            # 即使中途出错，也应用已经完成解析的结果
+            self._apply_parsed(pending, 0)
+    
+    def _submit_requests(self, model, prompts: List[Tuple[str, bytes]]) -> Dict[bytes, Future]:
+        """Submit each distinct (prompt, key) to the request pool
         
-        elif platform == 'mobile':
-            recommendations.extend(['React Native', 'Flutter', 'Swift/SwiftUI', 'Kotlin/Jetpack Compose'])
+        Requests already started speculatively during extraction are reused.
+        Returns an empty dict when there is a single distinct prompt that was
+        not started yet, in which case the caller runs the request itself.
+        """
+        speculative = self._speculative_requests
+        keys = {key for _, key in prompts}
+        if len(keys) < 2 and not any(key in speculative for key in keys):
+            return {}
+        requests: Dict[bytes, Future] = {}
+        for prompt, key in prompts:
+            if key not in requests:
+                request = speculative.pop(key, None)
+                if request is None:
+                    request = self._request_pool.submit(
+                        self._generate, model, prompt, prompt_cache_key=self._prompt_cache_key
+                    )
+                requests[key] = request
+        return requests
+    
+    def _speculate_detail(self, item: Any, original_text: str):
+        """Start the detail request for a requirement while the extraction is still streaming
         
-        elif platform == 'desktop':
-            recommendations.extend(['Electron', 'Tauri', 'PyQt/PySide', 'JavaFX'])
+        Uses exactly the prompt the later component/layout/interaction step
+        builds, so that step picks the running request up by its key. Only
+        called for closed top-level array elements, and at most
+        _SPECULATIVE_LIMIT such requests are pending at a time.
+        """
+        try:
+            if type(item) is not dict:
+                return
+            speculative = self._speculative_requests
+            if sum(not request.done() for request in speculative.values()) >= _SPECULATIVE_LIMIT:
+                return
+            fields = {**_REQ_DEFAULTS, **item}
+            template = _SPECULATIVE_TEMPLATES.get(_TYPE_BY_VALUE.get(fields['type']))
+            if template is None:
+                return
+            prompt = self._single_detail_prompt(template, fields['title'], fields['description'], original_text)
+            key = hashlib.sha1(prompt.encode("utf-8")).digest()
+            if key not in speculative:
+                speculative[key] = self._request_pool.submit(
+                    self._generate, self._get_analysis_model(), prompt, prompt_cache_key=self._prompt_cache_key
+                )
+        except Exception:
+            # 预先发起请求只是优化，失败时由后续步骤正常请求
+            pass
+    
+    def _apply_parsed(self, pending: Deque[Tuple[Requirement, Future]], keep: int):
+        """Apply finished background parses in order until at most `keep` remain pending
         
-        return recommendations
+        Requirement objects are only updated on the calling thread.
+        """
+        while len(pending) > keep:
+            requirement, future = pending.popleft()
+            analysis_result = future.result()
+            if analysis_result:
+                self._update_requirement_with_analysis(requirement, analysis_result)
     
-    def _extract_overview_fallback(self, response: str) -> Tuple[str, str]:
-        """Fallback method to extract overview from unstructured response"""
-        lines = response.split('\n')
-        overview = ""
-        audience = ""
+    def _validate_and_score(self, requirements: List[Requirement], project_overview: str, 
+                           target_audience: str, platform: str, original_text: str) -> AnalysisResult:
+        """Validate requirements and create analysis result with scores"""
         
-        for line in lines:
-            line = line.strip()
-            if 'overview' in line.lower() or 'project' in line.lower():
-                overview = line
-            elif 'audience' in line.lower() or 'user' in line.lower():
-                audience = line
+        # 一次遍历汇总类型、优先级和状态（需在识别歧义修改状态之前统计）
+        profile = _RequirementProfile.build(requirements)
         
-        return overview, audience
-    
-    # Prompt templates
-    def _get_initial_analysis_prompt(self) -> str:
-        return """
-        {language_instruction}
+        # Calculate completeness score
+        total_reqs = profile.total
+        completeness_score = profile.analyzed / total_reqs if total_reqs > 0 else 0.0
         
-        Analyze the following requirements text and extract individual requirements. 
-        Categorize each requirement by type and priority.
+        # Identify gaps and ambiguities
+        gaps = self._identify_gaps(profile, original_text)
+        ambiguities = self._identify_ambiguities(profile)
         
-        Requirements text:
-        {requirements_text}
+        # Calculate clarity score based on ambiguities
+        clarity_score = max(0.0, 1.0 - (len(ambiguities) / max(total_reqs, 1)) * 0.5)
         
-        Additional context:
-        {context}
+        # Calculate feasibility score (simplified)
+        feasibility_score = self._calculate_feasibility_score(profile)
         
-        Target platform: {platform}
+        # Generate recommendations
+        recommendations = self._generate_recommendations(profile, gaps, ambiguities)
         
-        Return a JSON array of requirements with this structure:
-        [
-            {{
-                "title": "Brief requirement title",
-                "description": "Detailed description",
-                "type": "functional|ui_component|layout|styling|interaction|data|performance|accessibility|business",
-                "priority": "critical|high|medium|low",
-                "rationale": "Why this requirement exists",
-                "acceptance_criteria": ["criteria 1", "criteria 2"],
-                "estimated_effort": "XS|S|M|L|XL",
-                "tags": ["tag1", "tag2"]
-            }}
-        ]
+        # Estimate development effort
+        total_effort, phases = self._estimate_development_effort(profile)
         
-        Ensure requirements are:
-        1. Specific and actionable
-        2. Properly categorized
-        3. Realistically prioritized
-        4. Include clear acceptance criteria
-        """
+        # Framework recommendations based on requirements
+        framework_recommendations = self._recommend_frameworks(profile, platform)
+        
+        return AnalysisResult(
+            requirements=requirements,
+            project_overview=project_overview,
+            target_audience=target_audience,
+            platform=platform,
+            framework_recommendations=framework_recommendations,
+            completeness_score=completeness_score,
+            clarity_score=clarity_score,
+            feasibility_score=feasibility_score,
+            gaps=gaps,
+            ambiguities=ambiguities,
+            recommendations=recommendations,
+            total_estimated_effort=total_effort,
+            development_phases=phases
+        )
     
-    def _get_component_extraction_prompt(self) -> str:
-        return """
-        {language_instruction}
+    def _requirements_from_stream(self, scanner: Optional[_JsonArrayStream], response: str,
+                                  original_text: str) -> List[Requirement]:
+        """Use the items decoded during streaming, or parse the full response if that was not possible"""
+        if scanner is not None and scanner.complete:
+            cleaned_response = _FENCE_RE.sub("", response).strip()
+            if cleaned_response.startswith('[') and cleaned_response.endswith(']'):
+                return self._requirements_from_dicts(scanner.items, original_text)
+        return self._parse_requirements_response(response, original_text)
+    
+    def _parse_requirements_response(self, response: str, original_text: str) -> List[Requirement]:
+        """Parse AI response into Requirement objects"""
+        requirements = []
         
-        对UI组件需求进行详细的需求分析: "{requirement_title}"
-        需求描述: {requirement_description}
+        try:
+            # Try to parse as JSON first: 多数响应本身就是纯JSON，直接解码，
+            # 失败时再移除markdown代码块标记（JSON解码只产生精确的dict/list类型，可直接比较类型）
+            try:
+                data = _loads(response)
+            except ValueError:
+                data = None
+            if type(data) is not dict and type(data) is not list:
+                cleaned_response = _FENCE_RE.sub("", response).strip()
+                if not cleaned_response.startswith(('{', '[')):
+                    # Fallback to text parsing
+                    return self._parse_requirements_text(cleaned_response, original_text)
+                data = _loads(cleaned_response)
+            
+            # 处理不同的数据结构
+            if type(data) is dict:
+                if 'requirements' in data:
+                    data = data['requirements']
+                    # requirements字段不是列表时按单个需求处理
+                    if type(data) is not list:
+                        data = [data]
+                else:
+                    # 如果是单个需求对象的字典，包装成列表
+                    data = [data]
+            
+            requirements = self._requirements_from_dicts(data, original_text)
+                
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            # Fallback to text parsing
+            self.error_occurred.emit(f"JSON parsing failed: {str(e)}, using text parsing fallback")
+            requirements = self._parse_requirements_text(response, original_text)
         
-        基于原始需求文档: {original_text}
+        return requirements
+    
+    def _requirements_from_dicts(self, items: List[Dict[str, Any]], source: str) -> List[Requirement]:
+        """Create Requirement objects from decoded dictionaries, skipping invalid entries"""
+        create = self._create_requirement_from_dict
+        return [req for req in map(create, items, repeat(source)) if req is not None]
+    
+    def _create_requirement_from_dict(self, data: Dict[str, Any], source: str) -> Optional[Requirement]:
+        """Create a Requirement object from dictionary data"""
+        try:
+            # 首先检查data是否为字典类型
+            if type(data) is not dict:
+                self.error_occurred.emit(f"Expected dict but got {type(data).__name__}: {data}")
+                return None
+            
+            fields = {**_REQ_DEFAULTS, **data}
+            
+            # 未知或缺失的类型/优先级使用默认值，不再丢弃整条需求
+            return Requirement(
+                title=fields['title'],
+                description=fields['description'],
+                type=_TYPE_BY_VALUE.get(fields['type'], RequirementType.FUNCTIONAL),
+                priority=_PRIORITY_BY_VALUE.get(fields['priority'], RequirementPriority.MEDIUM),
+                source=source,
+                rationale=fields['rationale'],
+                acceptance_criteria=_own_list(fields['acceptance_criteria']),
+                estimated_effort=fields['estimated_effort'],
+                tags=_own_list(fields['tags'])
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            self.error_occurred.emit(f"Error creating requirement: {str(e)}")
+            return None
+    
+    def _parse_requirements_text(self, response: str, source: str) -> List[Requirement]:
+        """Fallback text parsing for requirements"""
+        requirements = []
         
-        请从需求分析的角度深入分析这个UI组件需求，输出详细的需求规格说明。请返回JSON格式：
+        # Simple pattern matching for requirement-like text
+        current_req = None
+        description_parts: List[str] = []  # 当前需求的描述片段，结束时一次拼接
         
-        {{
-            "requirement_details": {{
-                "detailed_description": "对该组件需求的详细描述，包括功能目的、使用场景、预期效果",
-                "user_stories": [
-                    "作为用户，我希望能够...",
-                    "当我使用这个组件时，我期望..."
-                ],
-                "business_value": "这个组件为业务带来的价值和意义",
-                "functional_requirements": [
-                    "必须支持的具体功能点1",
-                    "必须支持的具体功能点2"
-                ],
-                "non_functional_requirements": [
-                    "性能要求：响应时间<300ms",
-                    "可用性要求：支持键盘导航",
-                    "兼容性要求：支持IE11+"
-                ],
-                "acceptance_criteria": [
-                    "验收标准1：当用户点击按钮时，应该...",
-                    "验收标准2：当输入无效数据时，应该显示...",
-                    "验收标准3：在移动端访问时，组件应该..."
-                ],
-                "constraints": [
-                    "设计约束：必须符合现有设计规范",
-                    "技术约束：需要兼容现有框架",
-                    "业务约束：不能超过预算限制"
-                ],
-                "assumptions": [
-                    "假设用户已经登录系统",
-                    "假设网络连接稳定"
-                ],
-                "dependencies": [
-                    "依赖于用户认证模块",
-                    "依赖于数据API接口"
-                ],
-                "risks": [
-                    "风险1：复杂交互可能影响性能",
-                    "风险2：浏览器兼容性问题"
-                ]
-            }},
-            "layout_considerations": {{
-                "description": "该组件在页面布局中的考虑因素",
-                "placement": "组件在页面中的位置和作用",
-                "responsive_needs": "响应式设计需求说明",
-                "spacing_requirements": "与其他元素的间距要求"
-            }},
-            "ux_considerations": {{
-                "usability": "易用性要求和考虑",
-                "accessibility": "无障碍访问要求",
-                "user_feedback": "用户反馈和状态提示需求",
-                "error_handling": "错误处理和用户引导"
-            }}
-        }}
+        for line in response.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+                
+            # Look for numbered items or bullet points
+            item = _LIST_ITEM_RE.match(line)
+            if item:
+                if current_req:
+                    current_req.description = ' '.join(description_parts)
+                    requirements.append(current_req)
+                
+                title = item.group(1).strip()
+                current_req = Requirement(
+                    title=title,
+                    description=title,
+                    source=source
+                )
+                description_parts = [title]
+            elif current_req and line:
+                # Add to description
+                description_parts.append(line)
         
-        注意：
-        1. 专注于需求分析，不要涉及具体的技术实现细节
-        2. 验收标准要具体、可测试、可衡量
-        3. 考虑用户体验和业务价值
-        4. 识别潜在的风险和依赖关系
-        """
+        if current_req:
+            current_req.description = ' '.join(description_parts)
+            requirements.append(current_req)
+        
+        return requirements
     
-    def _get_layout_analysis_prompt(self) -> str:
-        return """
-        {language_instruction}
+    def _identify_gaps(self, profile: _RequirementProfile, original_text: str) -> List[str]:
+        """Identify missing information in requirements"""
+        gaps = []
         
-        对布局需求进行详细的需求分析: {requirement_description}
+        # Check for common missing elements
+        by_type = profile.by_type
+        has_ui_components = bool(by_type.get(RequirementType.UI_COMPONENT))
+        has_layout = bool(by_type.get(RequirementType.LAYOUT))
+        has_styling = bool(by_type.get(RequirementType.STYLING))
+        has_interactions = bool(by_type.get(RequirementType.INTERACTION))
         
-        基于原始需求文档: {original_text}
+        if not has_ui_components:
+            gaps.append(tr("gap_no_ui_components"))
+        if not has_layout:
+            gaps.append(tr("gap_no_layout"))
+        if not has_styling:
+            gaps.append(tr("gap_no_styling"))
+        if not has_interactions:
+            gaps.append(tr("gap_no_interactions"))
         
-        请从需求分析的角度深入分析这个布局需求，输出详细的需求规格说明。请返回JSON格式：
+        # Check for incomplete requirements（提示模板在循环外各翻译一次）
+        templates = {key: tr(key) for key in ("gap_missing_description", "gap_missing_acceptance_criteria")}
+        for gap_key, title in profile.incomplete:
+            gaps.append(templates[gap_key].format(title=title))
         
-        {{
-            "requirement_details": {{
-                "detailed_description": "对该布局需求的详细描述，包括布局目的、信息架构、用户流程",
-                "user_stories": [
-                    "作为用户，我希望页面布局能够...",
-                    "当我浏览页面时，我期望信息组织..."
-                ],
-                "business_value": "这个布局设计为业务带来的价值",
-                "functional_requirements": [
-                    "必须清晰展示主要功能区域",
-                    "必须支持快速导航和信息查找",
-                    "必须适配不同设备屏幕"
-                ],
-                "acceptance_criteria": [
-                    "验收标准1：在桌面端，主要内容区域应占据...",
-                    "验收标准2：在移动端，导航菜单应该...",
-                    "验收标准3：页面加载后，用户应该能够在3秒内找到..."
-                ],
-                "constraints": [
-                    "设计约束：必须遵循既定的设计规范",
-                    "内容约束：需要容纳特定数量的信息模块",
-                    "技术约束：需要支持多种浏览器"
-                ]
-            }},
-            "information_architecture": {{
-                "content_hierarchy": "内容层级和重要性划分",
-                "navigation_flow": "用户导航流程和路径",
-                "content_grouping": "内容分组和关联关系"
-            }},
-            "responsive_requirements": {{
-                "breakpoint_behavior": "不同断点下的布局行为需求",
-                "content_priority": "内容在不同屏幕尺寸下的优先级",
-                "interaction_adaptation": "交互方式在不同设备上的适配需求"
-            }},
-            "ux_requirements": {{
-                "visual_hierarchy": "视觉层次和引导需求",
-                "scan_patterns": "用户浏览模式和视觉流",
-                "accessibility": "无障碍访问的布局要求"
-            }}
-        }}
+        return gaps
+    
+    def _identify_ambiguities(self, profile: _RequirementProfile) -> List[str]:
+        """Identify ambiguous or unclear requirements"""
+        ambiguities = []
         
-        注意：
-        1. 专注于布局的功能性和用户体验需求
-        2. 不要涉及具体的CSS实现细节
-        3. 考虑信息架构和用户认知
-        4. 验收标准要基于用户行为和业务目标
-        """
+        # 模糊用语与矛盾描述已在汇总遍历中识别，这里生成提示并标记状态
+        templates = {key: tr(key) for key in ("ambiguity_vague_language", "ambiguity_contradictory")}
+        for key, req, word in profile.ambiguous:
+            ambiguities.append(templates[key].format(title=req.title, word=word))
+            if word is not None:
+                req.status = RequirementStatus.AMBIGUOUS
+        
+        return ambiguities
     
-    def _get_styling_analysis_prompt(self) -> str:
-        return """
-        {language_instruction}
+    def _calculate_feasibility_score(self, profile: _RequirementProfile) -> float:
+        """Calculate feasibility score based on requirements complexity"""
+        if not profile.total:
+            return 1.0
         
-        Analyze styling requirements and provide specification as JSON:
-        {{
-            "theme": "light|dark|auto",
-            "colors": {{
-                "primary": "#007bff",
-                "secondary": "#6c757d",
-                "background": "#ffffff",
-                "text": "#333333"
-            }},
-            "typography": {{
-                "font_family": "Arial, sans-serif",
-                "font_sizes": {{
-                    "small": "12px",
-                    "medium": "16px",
-                    "large": "24px"
-                }},
-                "line_height": "1.5"
-            }},
-            "spacing": {{
-                "xs": "4px",
-                "sm": "8px",
-                "md": "16px",
-                "lg": "24px",
-                "xl": "32px"
-            }},
-            "borders": {{
-                "radius": "4px",
-                "width": "1px",
-                "style": "solid"
-            }},
-            "shadows": {{
-                "small": "0 1px 3px rgba(0,0,0,0.1)",
-                "medium": "0 4px 6px rgba(0,0,0,0.1)"
-            }},
-            "animations": [
-                {{
-                    "name": "fadeIn",
-                    "duration": "0.3s",
-                    "easing": "ease-in-out"
-                }}
-            ]
-        }}
-        """
+        total_score = 0.0
+        
+        # 每种（类型, 优先级）组合查表取分值，再乘以数量
+        for key, count in profile.type_priority_counts.items():
+            total_score += _FEASIBILITY_SCORES[key] * count
+        
+        return min(1.0, total_score / profile.total)
     
-    def _get_interaction_analysis_prompt(self) -> str:
-        return """
-        {language_instruction}
+    def _generate_recommendations(self, profile: _RequirementProfile, gaps: List[str], 
+                                ambiguities: List[str]) -> List[str]:
+        """Generate recommendations for improving requirements"""
+        recommendations = []
         
-        对交互需求进行详细的需求分析: {requirement_description}
+        if gaps:
+            recommendations.append(tr("recommendation_address_gaps"))
         
-        基于原始需求文档: {original_text}
+        if ambiguities:
+            recommendations.append(tr("recommendation_clarify_ambiguities"))
+        
+        # Check requirement balance
+        critical_count = len(profile.by_priority.get(RequirementPriority.CRITICAL, ()))
+        total_count = profile.total
         
-        请从需求分析的角度深入分析这个交互需求，输出详细的需求规格说明。请返回JSON格式：
+        if critical_count > total_count * 0.5:
+            recommendations.append(tr("recommendation_reduce_critical"))
         
-        {{
-            "requirement_details": {{
-                "detailed_description": "对该交互需求的详细描述，包括交互目的、使用场景、预期效果",
-                "user_stories": [
-                    "作为用户，当我执行某个操作时，我希望...",
-                    "在特定情况下，系统应该提供..."
-                ],
-                "business_value": "这个交互设计为业务和用户带来的价值",
-                "functional_requirements": [
-                    "必须支持的交互功能点1",
-                    "必须提供的用户反馈2"
-                ],
-                "acceptance_criteria": [
-                    "验收标准1：当用户点击时，在200ms内应该显示...",
-                    "验收标准2：当操作失败时，应该明确提示...",
-                    "验收标准3：支持键盘操作，Tab键顺序应该..."
-                ],
-                "error_scenarios": [
-                    "错误场景1：网络中断时的处理",
-                    "错误场景2：无效输入的反馈"
-                ]
-            }},
-            "interaction_flows": {{
-                "primary_flow": "主要交互流程的详细步骤",
-                "alternative_flows": "备选交互路径和分支",
-                "edge_cases": "边界情况和异常处理"
-            }},
-            "feedback_requirements": {{
-                "visual_feedback": "视觉反馈的需求说明",
-                "audio_feedback": "音频反馈需求（如适用）",
-                "haptic_feedback": "触觉反馈需求（如适用）",
-                "timing_requirements": "反馈时机和持续时间要求"
-            }},
-            "accessibility_requirements": {{
-                "keyboard_navigation": "键盘导航支持需求",
-                "screen_reader": "屏幕阅读器支持需求",
-                "motor_accessibility": "运动障碍用户的交互需求"
-            }}
-        }}
+        if critical_count == 0:
+            recommendations.append(tr("recommendation_identify_critical"))
         
-        注意：
-        1. 专注于交互的功能需求和用户体验
-        2. 不要涉及具体的JavaScript实现
-        3. 考虑所有可能的用户操作路径
-        4. 包含完整的错误处理需求
-        """
+        return recommendations
     
-    def _get_validation_prompt(self) -> str:
-        return """
-        {language_instruction}
+    def _get_language_instruction(self) -> str:
+        """Get language instruction for AI prompts based on user's language setting"""
+        language = self.config.get_app_setting("language", "zh_CN")
+        return _LANG_INSTRUCTIONS.get(language, _LANG_INSTRUCTIONS["en_US"])
+    
+    def _estimate_development_effort(self, profile: _RequirementProfile) -> Tuple[str, List[Dict[str, Any]]]:
+        """Estimate development effort and phases"""
+        # Simple effort estimation based on requirement types and priorities
+        effort_points = 0
         
-        Review the following requirements for completeness and clarity:
-        {requirements}
+        # 每种（类型, 优先级）组合查表取点数（已含优先级调整），再乘以数量
+        for key, count in profile.type_priority_counts.items():
+            effort_points += _EFFORT_POINTS[key] * count
         
-        Identify:
-        1. Missing information
-        2. Ambiguous requirements
-        3. Conflicting requirements
-        4. Implementation feasibility issues
+        # Convert to effort estimate
+        if effort_points <= 10:
+            total_effort = "S (Small - 1-2 weeks)"
+        elif effort_points <= 25:
+            total_effort = "M (Medium - 3-4 weeks)"
+        elif effort_points <= 50:
+            total_effort = "L (Large - 1-2 months)"
+        else:
+            total_effort = "XL (Extra Large - 2+ months)"
         
-        Return as JSON:
-        {{
-            "gaps": ["missing item 1", "missing item 2"],
-            "ambiguities": ["unclear requirement 1"],
-            "conflicts": ["requirement A conflicts with B"],
-            "feasibility_issues": ["complex requirement may need breakdown"]
-        }}
-        """
+        # Create development phases
+        by_priority = profile.by_priority
+        phases = [
+            {
+                "name": "Foundation",
+                "description": "Core setup and critical components",
+                "requirements": [req.id for req in by_priority.get(RequirementPriority.CRITICAL, ())],
+                "estimated_duration": "20-30% of total effort"
+            },
+            {
+                "name": "Core Features",
+                "description": "Main functionality implementation",
+                "requirements": [req.id for req in by_priority.get(RequirementPriority.HIGH, ())],
+                "estimated_duration": "40-50% of total effort"
+            },
+            {
+                "name": "Enhancement",
+                "description": "Additional features and polish",
+                "requirements": [
+                    req.id
+                    for priority in (RequirementPriority.MEDIUM, RequirementPriority.LOW)
+                    for req in by_priority.get(priority, ())
+                ],
+                "estimated_duration": "20-30% of total effort"
+            }
+        ]
+        
+        return total_effort, phases
     
-    def _get_requirement_list_prompt(self) -> str:
-        return """
-        {language_instruction}
+    def _recommend_frameworks(self, profile: _RequirementProfile, platform: str) -> List[str]:
+        """Recommend frameworks based on requirements and platform"""
+        recommendations = []
         
-        分析以下需求文本，提取出完整的需求列表。这是第一阶段分析，专注于识别和分类所有需求项目，确保完整性。
+        if platform == 'web':
+            has_complex_interactions = any(
+                len(req.interaction_specs) > 2
+                for req in profile.by_type.get(RequirementType.INTERACTION, ())
+            )
+            
+            has_many_components = len(profile.by_type.get(RequirementType.UI_COMPONENT, ())) > 10
+            
+            if has_complex_interactions or has_many_components:
+                recommendations.extend(['React', 'Vue.js', 'Angular'])
+            else:
+                recommendations.extend(['HTML/CSS/JavaScript', 'Alpine.js', 'Svelte'])
         
-        需求文本:
-        {requirements_text}
+        elif platform == 'mobile':
+            recommendations.extend(['React Native', 'Flutter', 'Swift/SwiftUI', 'Kotlin/Jetpack Compose'])
         
-        附加上下文:
-        {context}
+        elif platform == 'desktop':
+            recommendations.extend(['Electron', 'Tauri', 'PyQt/PySide', 'JavaFX'])
         
-        目标平台: {platform}
+        return recommendations
+    
+    def _extract_overview_fallback(self, response: str) -> Tuple[str, str]:
+        """Fallback method to extract overview from unstructured response"""
+        overview = ""
+        audience = ""
         
-        请返回一个JSON数组，包含所有识别出的需求项目。每个需求项目应该包含基本信息：
-        [
-            {{
-                "id": "REQ-001",
-                "title": "简明的需求标题",
-                "description": "需求的详细描述",
-                "type": "functional|ui_component|layout|styling|interaction|data|performance|accessibility|business",
-                "priority": "critical|high|medium|low",
-                "category": "核心功能|界面设计|数据处理|性能优化|其他",
-                "brief_rationale": "为什么需要这个需求的简要说明"
-            }}
-        ]
+        for line in response.splitlines():
+            line = line.strip()
+            lowered = line.lower()
+            if 'overview' in lowered or 'project' in lowered:
+                overview = line
+            elif 'audience' in lowered or 'user' in lowered:
+                audience = line
         
-        请确保：
-        1. 提取出所有明确或隐含的需求
-        2. 正确分类每个需求的类型
-        3. 合理设置优先级
-        4. 用简洁明确的语言描述每个需求
-        5. 不要遗漏任何重要的功能或特性需求
+        return overview, audience
+    
+    # Prompt templates
+    def _get_initial_analysis_prompt(self) -> str:
+        return _INITIAL_ANALYSIS_PROMPT
+    
+    def _get_component_extraction_prompt(self) -> str:
+        return _COMPONENT_EXTRACTION_PROMPT
+    
+    def _get_layout_analysis_prompt(self) -> str:
+        return _LAYOUT_ANALYSIS_PROMPT
+    
+    def _get_styling_analysis_prompt(self) -> str:
+        return _STYLING_ANALYSIS_PROMPT
+    
+    def _get_interaction_analysis_prompt(self) -> str:
+        return _INTERACTION_ANALYSIS_PROMPT
+    
+    def _get_validation_prompt(self) -> str:
+        return _VALIDATION_PROMPT
+    
+    def _get_requirement_list_prompt(self) -> str:
+        return _REQUIREMENT_LIST_PROMPT
+
+    def _parse_detailed_batch(self, response: str,
+                              scanner: Optional[_JsonArrayStream] = None) -> Dict[int, Dict[str, Any]]:
+        """解析批量详细分析的JSON数组响应，按需求编号返回各条分析结果
         
-        重点关注：
-        - 功能需求（用户可以做什么）
-        - UI组件需求（需要什么界面元素）
-        - 布局需求（界面如何组织）
-        - 交互需求（用户如何操作）
-        - 数据需求（需要处理什么数据）
-        - 性能需求（速度、响应时间等）
-        - 业务需求（业务逻辑和规则）
+        流式输出时各元素已由scanner边接收边解码，完整时直接使用，否则重新解析整个响应。
         """
-
+        data = None
+        if scanner is not None and scanner.complete:
+            cleaned_response = _FENCE_RE.sub("", response).strip()
+            if cleaned_response.startswith('[') and cleaned_response.endswith(']'):
+                data = scanner.items
+        if data is None:
+            data = _loads_plain(response)
+        if data is None:
+            json_text = _find_json_span(_FENCE_RE.sub("", response), '[', ']')
+            try:
+                data = _loads(json_text) if json_text else None
+            except ValueError:
+                data = None
+        
+        analyses = {}
+        if type(data) is list:
+            for item in data:
+                if type(item) is dict:
+                    try:
+                        analyses[int(item.pop('id'))] = item
+                    except (KeyError, TypeError, ValueError):
+                        continue
+        return analyses
+    
     def _parse_detailed_analysis(self, response: str) -> Optional[Dict[str, Any]]:
         """解析详细需求分析的JSON响应"""
         try:
-            # 清理响应，移除markdown代码块标记
-            cleaned_response = response.strip()
-            
-            # 移除 ```json 和 ``` 标记
-            if cleaned_response.startswith('```json'):
-                cleaned_response = cleaned_response[7:]
-            elif cleaned_response.startswith('```'):
-                cleaned_response = cleaned_response[3:]
-            
-            if cleaned_response.endswith('```'):
-                cleaned_response = cleaned_response[:-3]
-            
-            cleaned_response = cleaned_response.strip()
-            
-            # 解析JSON
-            if cleaned_response.startswith('{'):
-                data = json.loads(cleaned_response)
-                return data
+            # 直接截取第一个'{'到最后一个'}'，同时跳过markdown代码块标记与前后的说明文字
+            start = response.find('{')
+            end = response.rfind('}')
+            if start >= 0 and end > start:
+                return _loads(response[start:end + 1])
             else:
                 # 如果不是JSON格式，尝试从文本中提取信息
                 return self._extract_analysis_from_text(response)
@@ -1633,96 +2083,77 @@ class RequirementAnalyzer(BaseModule):
     
     def _extract_analysis_from_text(self, text: str) -> Dict[str, Any]:
         """从文本中提取分析信息的回退方法"""
-        # 简单的文本解析，提取关键信息
-        result = {
-            "requirement_details": {
-                "detailed_description": "",
-                "user_stories": [],
-                "business_value": "",
-                "functional_requirements": [],
-                "acceptance_criteria": [],
-                "constraints": [],
-                "assumptions": [],
-                "dependencies": [],
-                "risks": []
-            }
-        }
+        # 简单的文本解析，提取关键信息；只写入文本中实际出现的字段
+        details = {}
+        result = _TextAnalysis(requirement_details=details)
         
         # 尝试提取描述信息
-        lines = text.split('\n')
         current_section = ""
         
-        for line in lines:
+        for line in text.splitlines():
             line = line.strip()
             if not line:
                 continue
                 
             # 识别不同的段落
-            if "详细描述" in line or "描述" in line:
-                current_section = "description"
-            elif "用户故事" in line or "用户需求" in line:
-                current_section = "user_stories"
-            elif "验收标准" in line or "验收条件" in line:
-                current_section = "acceptance_criteria"
-            elif "业务价值" in line:
-                current_section = "business_value"
-            elif "功能需求" in line:
-                current_section = "functional_requirements"
-            elif "约束" in line:
-                current_section = "constraints"
-            elif "依赖" in line:
-                current_section = "dependencies"
-            elif "风险" in line:
-                current_section = "risks"
+            header = _SECTION_RE.match(line)
+            if header:
+                current_section = header.lastgroup
             else:
                 # 内容行
-                if current_section == "description" and result["requirement_details"]["detailed_description"] == "":
-                    result["requirement_details"]["detailed_description"] = line
-                elif current_section in ["user_stories", "acceptance_criteria", "functional_requirements", "constraints", "dependencies", "risks"]:
-                    if line.startswith(('- ', '• ', '1. ', '2. ', '3. ')):
-                        result["requirement_details"][current_section].append(line[2:].strip())
-                    elif line:
-                        result["requirement_details"][current_section].append(line)
-                elif current_section == "business_value" and result["requirement_details"]["business_value"] == "":
-                    result["requirement_details"]["business_value"] = line
+                if current_section == "description":
+                    details.setdefault("detailed_description", line)
+                elif current_section in _LIST_SECTIONS:
+                    if _BULLET_RE.match(line):
+                        line = line[2:].strip()
+                    details.setdefault(current_section, []).append(line)
+                elif current_section == "business_value":
+                    details.setdefault("business_value", line)
         
         return result
     
-    def _update_requirement_with_analysis(self, requirement: Requirement, analysis_result: Dict[str, Any]):
-        """使用详细分析结果更新需求对象"""
+    def _update_requirement_with_analysis(self, requirement: Requirement, analysis_result: Dict[str, Any],
+                                          now: Optional[datetime] = None):
+        """使用详细分析结果更新需求对象；now 为更新时间，批量更新时由调用方统一传入"""
+        # 详细分析阶段的结果写入缓存，供内容相同的需求复用；从文本回退解析出的结果不缓存
+        cache_key = self._detail_cache_keys.pop(requirement.id, None)
+        if cache_key is not None and type(analysis_result) is not _TextAnalysis:
+            self._detail_cache[cache_key] = analysis_result
+        
         try:
-            req_details = analysis_result.get("requirement_details", {})
+            req_details = analysis_result.get("requirement_details") or {}
+            get_detail = req_details.get
             
             # 更新详细描述
-            if req_details.get("detailed_description"):
-                requirement.description = req_details["detailed_description"]
+            detailed_description = get_detail("detailed_description")
+            if detailed_description:
+                requirement.description = detailed_description
             
             # 更新业务理由
-            if req_details.get("business_value"):
-                requirement.rationale = req_details["business_value"]
-            
-            # 更新验收标准
-            if req_details.get("acceptance_criteria"):
-                requirement.acceptance_criteria = req_details["acceptance_criteria"]
+            business_value = get_detail("business_value")
+            if business_value:
+                requirement.rationale = business_value
             
             # 更新依赖关系（转换为字符串列表）
-            if req_details.get("dependencies"):
+            dependencies = get_detail("dependencies")
+            if dependencies:
                 # 这里暂时存储为描述性文本，实际项目中可能需要解析为具体的需求ID
-                requirement.dependencies = [str(dep) for dep in req_details["dependencies"]]
+                requirement.dependencies = [str(dep) for dep in dependencies]
             
             # 在source字段中记录用户故事
-            if req_details.get("user_stories"):
-                user_stories_text = "\n".join([f"- {story}" for story in req_details["user_stories"]])
+            user_stories = get_detail("user_stories")
+            if user_stories:
+                user_stories_text = "\n".join(f"- {story}" for story in user_stories)
                 requirement.source = f"用户故事:\n{user_stories_text}"
             
             # 在tags中添加风险和约束信息
-            if req_details.get("risks"):
-                for risk in req_details["risks"]:
-                    requirement.tags.append(f"风险: {risk}")
+            risks = get_detail("risks")
+            if risks:
+                requirement.tags.extend([f"风险: {risk}" for risk in risks])
             
-            if req_details.get("constraints"):
-                for constraint in req_details["constraints"]:
-                    requirement.tags.append(f"约束: {constraint}")
+            constraints = get_detail("constraints")
+            if constraints:
+                requirement.tags.extend([f"约束: {constraint}" for constraint in constraints])
             
             # 如果有布局考虑，创建布局规格对象
             if "layout_considerations" in analysis_result:
@@ -1736,17 +2167,25 @@ class RequirementAnalyzer(BaseModule):
                     alignment={}
                 )
             
-            # 如果有UX考虑，可以记录在其他字段中
+            # 如果有UX考虑，作为非功能性需求追加到验收标准中
+            ux_additions = []
             if "ux_considerations" in analysis_result:
                 ux_info = analysis_result["ux_considerations"]
-                # 将UX考虑作为非功能性需求添加到验收标准中
                 if ux_info.get("usability"):
-                    requirement.acceptance_criteria.append(f"易用性要求: {ux_info['usability']}")
+                    ux_additions.append(f"易用性要求: {ux_info['usability']}")
                 if ux_info.get("accessibility"):
-                    requirement.acceptance_criteria.append(f"无障碍要求: {ux_info['accessibility']}")
+                    ux_additions.append(f"无障碍要求: {ux_info['accessibility']}")
+            
+            # 更新验收标准：基础条目与UX条目一次性组装为新列表，
+            # 不修改（可能被缓存复用的）分析结果
+            acceptance_criteria = get_detail("acceptance_criteria")
+            if acceptance_criteria:
+                requirement.acceptance_criteria = [*acceptance_criteria, *ux_additions]
+            elif ux_additions:
+                requirement.acceptance_criteria.extend(ux_additions)
             
             # 更新时间戳
-            requirement.updated_at = datetime.now()
+            requirement.updated_at = now or datetime.now()
             
         except Exception as e:
             self.error_occurred.emit(f"Error updating requirement with analysis: {str(e)}")
\ No newline at end of file
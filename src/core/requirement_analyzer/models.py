@@ -5,9 +5,13 @@ Data models for requirements analysis
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Union
 from enum import Enum
+import sys
 import uuid
 from datetime import datetime
 
+# Python 3.10+ 的数据类可生成 __slots__，实例不再携带 __dict__；旧版本保持普通数据类
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class RequirementType(Enum):
     """Types of requirements"""
     FUNCTIONAL = "functional"        # What the system should do
@@ -36,7 +40,7 @@ class RequirementStatus(Enum):
     INCOMPLETE = "incomplete"      # Missing information
     AMBIGUOUS = "ambiguous"       # Needs clarification
 
-@dataclass
+@dataclass(**_SLOTS)
 class ComponentSpec:
     """Specification for a UI component"""
     name: str
@@ -78,7 +82,7 @@ class ComponentSpec:
             accessibility=data.get('accessibility')
         )
 
-@dataclass
+@dataclass(**_SLOTS)
 class LayoutSpec:
     """Specification for layout structure"""
     type: str  # grid, flex, absolute, flow, etc.
@@ -110,7 +114,7 @@ class LayoutSpec:
             alignment=data.get('alignment')
         )
 
-@dataclass
+@dataclass(**_SLOTS)
 class StyleSpec:
     """Specification for styling requirements"""
     theme: Optional[str] = None
@@ -145,7 +149,7 @@ class StyleSpec:
             animations=data.get('animations', [])
         )
 
-@dataclass
+@dataclass(**_SLOTS)
 class InteractionSpec:
     """Specification for user interactions"""
     trigger: str  # click, hover, scroll, keyboard, etc.
@@ -177,7 +181,7 @@ class InteractionSpec:
             validation=data.get('validation')
         )
 
-@dataclass
+@dataclass(**_SLOTS)
 class Requirement:
     """A single requirement with detailed specifications"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -2,10 +2,10 @@
 DeepSeek model implementation
 """
 
-import requests
 import json
 from typing import Dict, Any, List
 from .base_model import BaseModel
+from .http_pool import get_requests_session
 
 class DeepSeekModel(BaseModel):
     """DeepSeek model implementation"""
@@ -29,7 +29,7 @@ class DeepSeekModel(BaseModel):
                 "stream": False
             }
             
-            response = requests.post(
+            response = get_requests_session().post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
@@ -72,7 +72,7 @@ class DeepSeekModel(BaseModel):
                 "stream": False
             }
             
-            response = requests.post(
+            response = get_requests_session().post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
@@ -99,7 +99,7 @@ class DeepSeekModel(BaseModel):
                 "stream": False
             }
             
-            response = requests.post(
+            response = get_requests_session().post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
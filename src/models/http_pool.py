@@ -0,0 +1,45 @@
+"""
+Process-wide HTTP connection pools shared by model clients
+"""
+
+import threading
+
+# 连接池上限：并发分析时允许的最大连接数与保持活动的连接数
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+_lock = threading.Lock()
+_httpx_client = None
+_requests_session = None
+
+def get_httpx_client():
+    """Get the shared httpx client passed to SDK based models (e.g. OpenAI)"""
+    global _httpx_client
+    if _httpx_client is None:
+        with _lock:
+            if _httpx_client is None:
+                import httpx  # openai SDK 的依赖
+                _httpx_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                    ),
+                    follow_redirects=True
+                )
+    return _httpx_client
+
+def get_requests_session():
+    """Get the shared requests session used by REST based models (e.g. DeepSeek)"""
+    global _requests_session
+    if _requests_session is None:
+        with _lock:
+            if _requests_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=MAX_KEEPALIVE_CONNECTIONS,
+                                      pool_maxsize=MAX_CONNECTIONS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _requests_session = session
+    return _requests_session
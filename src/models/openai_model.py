@@ -5,6 +5,7 @@ OpenAI model implementation
 import json
 from typing import Dict, Any, List
 from .base_model import BaseModel
+from .http_pool import get_httpx_client
 
 class OpenAIModel(BaseModel):
     """OpenAI model implementation"""
@@ -16,11 +17,21 @@ class OpenAIModel(BaseModel):
             self.client = openai.OpenAI(
                 api_key=self.config.api_key,
                 base_url=self.config.base_url,
-                timeout=self.config.timeout
+                timeout=self.config.timeout,
+                http_client=get_httpx_client()
             )
         except ImportError:
             raise ImportError("OpenAI library not installed. Run: pip install openai")
     
+    def _extra_body(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build extra request fields understood only by the official OpenAI endpoint"""
+        extra = {}
+        cache_key = kwargs.get('prompt_cache_key')
+        # 兼容OpenAI接口的第三方服务可能拒绝未知字段，仅对官方接口发送
+        if cache_key and (not self.config.base_url or "api.openai.com" in self.config.base_url):
+            extra['prompt_cache_key'] = cache_key
+        return extra
+    
     def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text from prompt"""
         try:
@@ -29,7 +40,8 @@ class OpenAIModel(BaseModel):
                 messages=[{"role": "user", "content": prompt}],
                 # max_tokens=kwargs.get('max_tokens', self.config.max_tokens),
                 temperature=kwargs.get('temperature', self.config.temperature),
-                timeout=kwargs.get('timeout', self.config.timeout)
+                timeout=kwargs.get('timeout', self.config.timeout),
+                extra_body=self._extra_body(kwargs) or None
             )
             return response.choices[0].message.content
         except Exception as e:
@@ -43,7 +55,8 @@ class OpenAIModel(BaseModel):
                 messages=[{"role": "user", "content": prompt}],
                 temperature=kwargs.get('temperature', self.config.temperature),
                 timeout=kwargs.get('timeout', self.config.timeout),
-                stream=True
+                stream=True,
+                extra_body=self._extra_body(kwargs) or None
             )
             
             for chunk in stream:
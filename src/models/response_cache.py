@@ -0,0 +1,94 @@
+"""
+Process-wide cache of model responses for deterministic (temperature 0) requests
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 内存中最多保留的响应数，超出后淘汰最久未使用的
+MAX_ENTRIES = 256
+# 磁盘缓存默认目录（需调用 enable_disk_cache() 开启）
+DEFAULT_DISK_DIR = Path.home() / ".cache" / "ui_easy" / "llm"
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, str]" = OrderedDict()
+_disk_dir: Optional[Path] = None
+
+def is_cacheable(model, kwargs: Dict[str, Any]) -> bool:
+    """Only temperature 0 requests are cached; sampled responses are expected to vary"""
+    return kwargs.get('temperature', model.config.temperature) == 0
+
+def make_key(model, prompt: str) -> str:
+    """Key a prompt by the provider, endpoint and model that answer it"""
+    config = model.config
+    data = "\0".join((config.provider, config.base_url or "", config.model_id, prompt))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+def enable_disk_cache(directory: Optional[Path] = None):
+    """Also persist cached responses as <key>.json files so they survive restarts"""
+    global _disk_dir
+    _disk_dir = Path(directory) if directory else DEFAULT_DISK_DIR
+
+def disable_disk_cache():
+    """Keep cached responses in memory only"""
+    global _disk_dir
+    _disk_dir = None
+
+def get(key: str) -> Optional[str]:
+    """Return the cached response for key, or None"""
+    with _lock:
+        response = _entries.get(key)
+        if response is not None:
+            _entries.move_to_end(key)
+            return response
+
+    disk_dir = _disk_dir
+    if disk_dir is None:
+        return None
+    try:
+        with open(disk_dir / f"{key}.json", encoding="utf-8") as f:
+            response = json.load(f)["response"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(response, str):
+        return None
+    _remember(key, response)
+    return response
+
+def put(key: str, response: str):
+    """Store a response in memory and, when enabled, on disk"""
+    _remember(key, response)
+
+    disk_dir = _disk_dir
+    if disk_dir is None:
+        return
+    # 先写临时文件再替换，其他进程/线程不会读到写了一半的文件
+    tmp_path = disk_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        disk_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"response": response}, f, ensure_ascii=False)
+        os.replace(tmp_path, disk_dir / f"{key}.json")
+    except OSError:
+        # 磁盘缓存只是优化，写入失败时忽略
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def clear():
+    """Drop all in-memory entries"""
+    with _lock:
+        _entries.clear()
+
+def _remember(key: str, response: str):
+    with _lock:
+        _entries[key] = response
+        _entries.move_to_end(key)
+        if len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
@@ -2,6 +2,11 @@
 UI components for UI Easy
 """
 
-from .main_window import MainWindow
+__all__ = ['MainWindow']
 
-__all__ = ['MainWindow']
\ No newline at end of file
+def __getattr__(name):
+    # 主窗口按需导入：核心模块只用到 ui.localization，不必加载整个Qt界面
+    if name == 'MainWindow':
+        from .main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
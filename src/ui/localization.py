@@ -293,6 +293,8 @@ class Localization:
                 "analyzing_component": "分析组件 {current}/{total}: {title}",
                 "component_analysis_complete": "✅ 组件 {title} 分析完成",
                 "component_analysis_failed": "⚠️ 组件 {title} 分析失败",
+                "reusing_cached_analysis": "♻️ 与前面的需求内容相同，复用已有分析结果",
+                "speculative_requests_unused": "{count} 个预先发起的分析请求未被最终需求使用",
                 "starting_requirements_analysis": "开始需求分析...",
                 "analyzing_requirements_overview": "正在分析需求概述...",
                 "extracting_categorizing_requirements": "正在提取和分类需求...",
@@ -612,6 +614,8 @@ class Localization:
                 "analyzing_component": "Analyzing component {current}/{total}: {title}",
                 "component_analysis_complete": "✅ Component {title} analysis complete",
                 "component_analysis_failed": "⚠️ Component {title} analysis failed",
+                "reusing_cached_analysis": "♻️ Identical to an earlier requirement, reusing its analysis",
+                "speculative_requests_unused": "{count} speculative analysis requests were not used by the final requirements",
                 "starting_requirements_analysis": "Starting requirements analysis...",
                 "analyzing_requirements_overview": "Analyzing requirements overview...",
                 "extracting_categorizing_requirements": "Extracting and categorizing requirements...",
@@ -103,6 +103,11 @@ class MainWindow(QMainWindow):
         # Load initial settings
         self.load_initial_settings()
     
+    def closeEvent(self, event):
+        """Release the requirement analyzer's worker threads when the window closes"""
+        self.requirement_analyzer.shutdown()
+        super().closeEvent(event)
+    
     def setup_ui(self):
         """Setup the user interface"""
         central_widget = QWidget()
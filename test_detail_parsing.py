@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the streamed JSON scanner and batched detail analysis parsing
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.config import Config
+from core.requirement_analyzer.analyzer import RequirementAnalyzer, _JsonArrayStream
+from core.requirement_analyzer.models import Requirement, RequirementType, RequirementStatus
+
+# 合法的JSON数组：嵌套、字符串内的括号与引号、转义、Unicode，以及前后的代码块标记
+VALID_ARRAYS = [
+    '[]',
+    '[{"a": 1}]',
+    '[{"t": "quote \\" inside", "n": {"deep": [1, {"x": "}]"}]}}, {"b": "back\\\\slash \\\\"}]',
+    ' [ {"u": "\\u4e2d文 {[", "e": []} ,\n {"k": null, "l": [[], [{}]]} ] ',
+    '```json\n[{"title": "登录", "tags": ["a", "b"]}, {"title": "注册"}]\n```',
+]
+
+# 不是对象数组或格式错误的响应，调用方需改为解析完整响应
+INVALID_ARRAYS = [
+    '{"requirements": [{"a": 1}]}',
+    '[{"a": 1} {"b": 2}]',
+    '[{"a": 1},, {"b": 2}]',
+    '[{"a": 1},]',
+    '[{"a": 1}, 2]',
+    '[{"a": 1}] {"b": 2}',
+    '[{"a": [1}]',
+]
+
+def _scan(text, size):
+    """Feed text to a new scanner in chunks of the given size"""
+    seen = []
+    scanner = _JsonArrayStream(seen.append)
+    for i in range(0, len(text), size):
+        scanner.feed(text[i:i + size])
+    return scanner, seen
+
+def _expected_items(text):
+    return json.loads(text.replace('```json', '').replace('```', ''))
+
+def test_scanner_matches_json_loads():
+    """Scanner output equals json.loads for every way of splitting the stream"""
+    try:
+        for text in VALID_ARRAYS:
+            expected = _expected_items(text)
+            for size in (1, 2, 3, 7, len(text)):
+                scanner, seen = _scan(text, size)
+                assert scanner.complete, (text, size)
+                assert scanner.items == expected, (text, size, scanner.items)
+                assert seen == expected, (text, size, seen)
+        print("✓ Streamed items match json.loads for nested, escaped and split input")
+        return True
+    except AssertionError as e:
+        print(f"✗ Scanner error: {e}")
+        return False
+
+def test_scanner_rejects_malformed():
+    """Malformed or non-array responses are never reported as complete"""
+    try:
+        for text in INVALID_ARRAYS:
+            for size in (1, 4, len(text)):
+                scanner, _ = _scan(text, size)
+                assert not scanner.complete, (text, size)
+        
+        # 未结束的数组也不算完整；reset() 后可重新扫描
+        scanner, _ = _scan('[{"a": 1}, {"b": "unterminated', 5)
+        assert not scanner.complete
+        scanner.reset()
+        scanner.feed('[{"a": 1}]')
+        assert scanner.complete and scanner.items == [{"a": 1}]
+        print("✓ Malformed and truncated arrays are rejected")
+        return True
+    except AssertionError as e:
+        print(f"✗ Scanner error: {e}")
+        return False
+
+def _analyzer():
+    directory = tempfile.mkdtemp()
+    return RequirementAnalyzer(Config(os.path.join(directory, 'config.json')))
+
+def _analysis(description):
+    return {"requirement_details": {"detailed_description": description}}
+
+def test_batch_id_mapping():
+    """Batch results are matched to requirements by id; missing ids are analyzed one at a time"""
+    try:
+        analyzer = _analyzer()
+        items = [
+            dict(_analysis("first"), id=1),
+            _analysis("no id"),
+            dict(_analysis("third"), id="3"),
+            dict(_analysis("third again"), id=3),
+            dict(_analysis("out of range"), id=9),
+            "not an object",
+        ]
+        response = json.dumps(items, ensure_ascii=False)
+        
+        analyses = analyzer._parse_detailed_batch(response)
+        assert sorted(analyses) == [1, 3, 9], sorted(analyses)
+        # 重复的编号以最后一条为准
+        assert analyses[3]["requirement_details"]["detailed_description"] == "third again"
+        
+        # 流式扫描得到的结果与重新解析整个响应一致
+        scanner, _ = _scan('```json\n' + response + '\n```', 16)
+        assert analyzer._parse_detailed_batch('```json\n' + response + '\n```', scanner) == analyses
+        
+        batch = [Requirement(title=f"组件{i}", description="", type=RequirementType.UI_COMPONENT)
+                 for i in range(1, 4)]
+        retried = []
+        analyzer._apply_detail_batch(batch, analyses, "doc", lambda req, text: retried.append(req.title))
+        assert batch[0].description == "first" and batch[0].status is RequirementStatus.ANALYZED
+        assert batch[2].description == "third again" and batch[2].status is RequirementStatus.ANALYZED
+        assert retried == ["组件2"], retried
+        
+        # 无法解析的响应没有任何结果，整批逐条重新分析
+        assert analyzer._parse_detailed_batch("抱歉，无法分析") == {}
+        analyzer.shutdown()
+        print("✓ Batch results mapped by id, missing ids retried individually")
+        return True
+    except AssertionError as e:
+        print(f"✗ Batch parsing error: {e}")
+        return False
+
+def main():
+    """Run all tests"""
+    print("Detail Parsing Test")
+    print("=" * 30)
+    
+    tests = [
+        ("Scanner Test", test_scanner_matches_json_loads),
+        ("Malformed Input Test", test_scanner_rejects_malformed),
+        ("Batch Id Test", test_batch_id_mapping),
+    ]
+    
+    passed = 0
+    total = len(tests)
+    
+    for test_name, test_func in tests:
+        print(f"\n{test_name}:")
+        if test_func():
+            passed += 1
+        else:
+            print(f"  Test failed!")
+    
+    print(f"\nTest Results: {passed}/{total} tests passed")
+    
+    if passed != total:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
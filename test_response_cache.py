@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the model response cache
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.config import ModelConfig
+from models import response_cache
+
+def _model(provider="deepseek", model_id="deepseek-chat", temperature=0.0, base_url=None):
+    """Stand-in model: the cache only reads model.config"""
+    return SimpleNamespace(config=ModelConfig(name="test", provider=provider, api_key="key",
+                                              base_url=base_url, model_id=model_id,
+                                              temperature=temperature))
+
+def test_cache_key():
+    """Keys depend on provider, endpoint, model and prompt"""
+    try:
+        key = response_cache.make_key(_model(), "prompt")
+        assert key == response_cache.make_key(_model(), "prompt")
+        assert key != response_cache.make_key(_model(provider="openai"), "prompt")
+        assert key != response_cache.make_key(_model(model_id="deepseek-reasoner"), "prompt")
+        assert key != response_cache.make_key(_model(base_url="https://example.com/v1"), "prompt")
+        assert key != response_cache.make_key(_model(), "other prompt")
+        print("✓ Cache key includes provider, base URL, model ID and prompt")
+        return True
+    except AssertionError as e:
+        print(f"✗ Cache key error: {e}")
+        return False
+
+def test_temperature_gate():
+    """Only temperature 0 requests are cacheable"""
+    try:
+        assert response_cache.is_cacheable(_model(temperature=0.0), {})
+        assert not response_cache.is_cacheable(_model(temperature=0.7), {})
+        # 调用时传入的温度优先于模型配置
+        assert response_cache.is_cacheable(_model(temperature=0.7), {'temperature': 0})
+        assert not response_cache.is_cacheable(_model(temperature=0.0), {'temperature': 0.5})
+        print("✓ Requests with temperature > 0 are not cached")
+        return True
+    except AssertionError as e:
+        print(f"✗ Temperature gate error: {e}")
+        return False
+
+def test_disk_persistence():
+    """Entries are written atomically to disk and survive clearing the memory cache"""
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            response_cache.enable_disk_cache(directory)
+            try:
+                key = response_cache.make_key(_model(), "persist me")
+                with mock.patch.object(response_cache.os, "replace", wraps=os.replace) as replace:
+                    response_cache.put(key, "响应内容")
+                assert replace.call_count == 1
+                assert replace.call_args[0][1] == Path(directory) / f"{key}.json"
+                assert os.listdir(directory) == [f"{key}.json"], os.listdir(directory)
+                
+                response_cache.clear()
+                assert response_cache.get(key) == "响应内容"
+                assert response_cache.get(response_cache.make_key(_model(), "missing")) is None
+            finally:
+                response_cache.disable_disk_cache()
+                response_cache.clear()
+        print("✓ Disk cache written via os.replace and read back after restart")
+        return True
+    except AssertionError as e:
+        print(f"✗ Disk cache error: {e}")
+        return False
+
+def main():
+    """Run all tests"""
+    print("Response Cache Test")
+    print("=" * 30)
+    
+    tests = [
+        ("Cache Key Test", test_cache_key),
+        ("Temperature Test", test_temperature_gate),
+        ("Disk Cache Test", test_disk_persistence),
+    ]
+    
+    passed = 0
+    total = len(tests)
+    
+    for test_name, test_func in tests:
+        print(f"\n{test_name}:")
+        if test_func():
+            passed += 1
+        else:
+            print(f"  Test failed!")
+    
+    print(f"\nTest Results: {passed}/{total} tests passed")
+    
+    if passed != total:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()